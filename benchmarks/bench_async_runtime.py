@@ -0,0 +1,144 @@
+"""
+Sequential loop vs. asyncio runtime, on the fake terminal.
+
+    python -m benchmarks.bench_async_runtime --cycles 20 --latency 0.005 --alert-latency 0.15
+
+Each cycle is one pass of the bot without the 60s wait. Both variants use the
+same helpers; only the scheduling differs. MT5 round-trips are simulated with
+`fake_mt5.LATENCY` and Telegram posts with a sleep of `--alert-latency`, and
+every cycle is forced into the order path (the real `trade_decision` still runs)
+so order sends and alerts are part of the measurement.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from services import fake_mt5
+
+fake_mt5.install()
+
+from services import async_runtime
+from services.async_runtime import BotRuntime
+from services.execution import execute_signal, review_positions
+from services.mt5_client import fetch_price_history, initialize_mt5, shutdown_mt5
+from strategies import supertrend_strategy
+from utils import telegram_alert
+
+SYMBOL = "XAUUSD"
+
+
+def forced_decision(df):
+    """Run the real strategy for its cost, then always return a BUY."""
+    supertrend_strategy.trade_decision(df)
+    close = df["close"].iloc[-1]
+    return "BUY", close - 3.0, 4.0
+
+
+def seed_losing_positions(count):
+    """Open BUYs well above market so every cycle runs the early-exit checks."""
+    tick = fake_mt5.symbol_info_tick(SYMBOL)
+    for _ in range(count):
+        fake_mt5.order_send(
+            {
+                "symbol": SYMBOL,
+                "volume": 0.1,
+                "type": fake_mt5.ORDER_TYPE_BUY,
+                "price": tick.ask + 10.0,
+                "sl": 0.0,
+                "tp": 0.0,
+            }
+        )
+
+
+def run_sequential(cycles):
+    """The pre-asyncio main.py loop body, back to back."""
+    timings = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        book = review_positions(SYMBOL)
+        df = fetch_price_history(SYMBOL, count=150, timeframe=fake_mt5.TIMEFRAME_M5)
+        signal, stop_loss_price, take_profit_points = forced_decision(df)
+        execute_signal(
+            SYMBOL,
+            signal,
+            stop_loss_price,
+            take_profit_points,
+            current_price=df["close"].iloc[-1],
+            latest_atr=df["atr"].iloc[-1],
+            balance=10000.0,
+            book=book,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run_async(cycles):
+    runtime = BotRuntime(SYMBOL, interval=0)
+    telegram_alert.set_alert_dispatcher(runtime._notify.submit)
+    await runtime.start(login=1, password="", server="")
+    timings = []
+    try:
+        for _ in range(cycles):
+            runtime.last_trade_candle_time = None
+            start = time.perf_counter()
+            await runtime.cycle()
+            timings.append(time.perf_counter() - start)
+    finally:
+        await runtime.shutdown()
+    return timings
+
+
+def report(name, timings):
+    ms = sorted(t * 1000 for t in timings)
+    print(
+        f"{name:<10} cycles={len(ms):<4} mean={statistics.mean(ms):8.1f} ms  "
+        f"p50={statistics.median(ms):8.1f} ms  max={ms[-1]:8.1f} ms"
+    )
+    return statistics.mean(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds per MT5 call")
+    parser.add_argument("--alert-latency", type=float, default=0.15, help="seconds per Telegram post")
+    parser.add_argument("--positions", type=int, default=5, help="losing positions to seed")
+    args = parser.parse_args()
+
+    def slow_post(message):
+        time.sleep(args.alert_latency)
+
+    telegram_alert._post_telegram_alert = slow_post
+    async_runtime.trade_decision = forced_decision
+
+    # Keep trades_log.csv / gold_bot.log / last_trade.json out of the repo.
+    os.chdir(tempfile.mkdtemp(prefix="bench_runtime_"))
+    sys.stdout = open(os.devnull, "w")
+
+    fake_mt5.reset()
+    initialize_mt5(1, "", "")
+    seed_losing_positions(args.positions)
+    fake_mt5.LATENCY = args.latency
+    sequential = run_sequential(args.cycles)
+    shutdown_mt5()
+
+    fake_mt5.reset()
+    fake_mt5.LATENCY = 0.0
+    fake_mt5.initialize()
+    seed_losing_positions(args.positions)
+    fake_mt5.LATENCY = args.latency
+    concurrent = asyncio.run(run_async(args.cycles))
+
+    sys.stdout = sys.__stdout__
+    seq_mean = report("sequential", sequential)
+    async_mean = report("asyncio", concurrent)
+    print(f"speedup    {seq_mean / async_mean:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
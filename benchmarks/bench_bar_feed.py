@@ -0,0 +1,70 @@
+"""
+Fan-out latency of the shared-memory bar feed vs. number of strategy processes.
+
+    python -m benchmarks.bench_bar_feed --strategies 1 2 4 8 --seconds 5
+
+Runs `FeedHub` on the fake terminal and runs `trade_decision` in every worker.
+For each pool size it reports the time from a publish in the feed process
+until a worker picks it up, and the feed's terminal calls per second. The
+call rate should stay flat as strategies are added.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from services.bar_feed import FeedHub
+
+STRATEGY = "strategies.supertrend_strategy:trade_decision"
+
+
+def run(count, seconds, poll_interval):
+    hub = FeedHub("XAUUSD", {f"s{i}": STRATEGY for i in range(count)})
+    hub.start(login=1, password="", server="", poll_interval=poll_interval)
+    start = time.monotonic()
+    reports = 0
+    for _ in hub.signals(timeout=seconds):
+        reports += 1
+        if time.monotonic() - start >= seconds:
+            break
+    calls_per_sec = hub.terminal_calls() / (time.monotonic() - start)
+    hub.stop()
+    return hub.latency_summary(), reports, calls_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strategies", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    os.environ["MT5_BACKEND"] = "fake"
+    os.chdir(tempfile.mkdtemp(prefix="bench_feed_"))
+
+    # Silence the bot's logging in all processes (children inherit fd 1).
+    stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    results = []
+    try:
+        os.dup2(devnull, 1)
+        for count in args.strategies:
+            results.append((count, *run(count, args.seconds, args.poll_interval)))
+    finally:
+        sys.stdout.flush()
+        os.dup2(stdout, 1)
+
+    for count, summary, reports, calls_per_sec in results:
+        p50 = statistics.median(s["p50"] for s in summary.values()) if summary else float("nan")
+        p95 = max((s["p95"] for s in summary.values()), default=float("nan"))
+        print(
+            f"strategies={count:<3} updates={reports:<6} fan-out p50={p50:7.3f} ms  "
+            f"p95={p95:7.3f} ms  terminal calls/s={calls_per_sec:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+from dotenv import load_dotenv
+
+from services.bar_feed import FeedHub
+from utils.trade_logger import log
+
+load_dotenv(override=True)
+LOGIN = int(os.getenv("LOGIN"))
+PASSWORD = os.getenv("PASSWORD")
+SERVER = os.getenv("SERVER")
+
+symbol = "XAUUSD"
+
+# name -> "module:function"; each runs in its own process off the shared feed
+STRATEGIES = {
+    "supertrend": "strategies.supertrend_strategy:trade_decision",
+}
+
+if __name__ == "__main__":
+    log("\n🚀 Starting Gold Bot bar feed...")
+    log("-" * 60)
+
+    hub = FeedHub(symbol, STRATEGIES)
+    hub.start(login=LOGIN, password=PASSWORD, server=SERVER)
+    last = {}
+    try:
+        while True:
+            for report in hub.signals():
+                key = (report["signal"], report["candle"])
+                if report["signal"] and last.get(report["strategy"]) != key:
+                    last[report["strategy"]] = key
+                    log(
+                        f"📣 [{report['strategy']}] {report['signal']} on {report['candle']} | "
+                        f"SL: {report['stop_loss']:.2f} | TP: {report['take_profit']:.2f} | "
+                        f"fan-out {report['fanout_ms']:.2f} ms"
+                    )
+    except KeyboardInterrupt:
+        log("🛑 Feed stopped manually.")
+    finally:
+        hub.stop()
+        for name, stats in hub.latency_summary().items():
+            log(
+                f"⏱ {name}: {stats['count']} updates | fan-out p50 {stats['p50']:.2f} ms | "
+                f"p95 {stats['p95']:.2f} ms | max {stats['max']:.2f} ms"
+            )
@@ -0,0 +1,30 @@
+import os
+from dotenv import load_dotenv
+
+from services.multi_account import load_accounts, run_coordinator
+from utils.trade_logger import log
+
+load_dotenv(override=True)
+LOGIN = int(os.getenv("LOGIN"))
+PASSWORD = os.getenv("PASSWORD")
+SERVER = os.getenv("SERVER")
+TERMINAL_PATH = os.getenv("TERMINAL_PATH")  # data login's terminal; executors use their own
+ACCOUNTS_FILE = os.getenv("ACCOUNTS_FILE", "accounts.json")
+
+symbol = "XAUUSD"
+
+if __name__ == "__main__":
+    log("\n🚀 Starting Gold Bot (multi-account)...")
+    log("-" * 60)
+
+    accounts = load_accounts(ACCOUNTS_FILE)
+    log(f"👥 Loaded {len(accounts)} execution accounts from {ACCOUNTS_FILE}")
+
+    run_coordinator(
+        symbol,
+        data_login=LOGIN,
+        data_password=PASSWORD,
+        data_server=SERVER,
+        data_path=TERMINAL_PATH,
+        accounts=accounts,
+    )
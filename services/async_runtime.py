@@ -0,0 +1,198 @@
+"""
+asyncio runtime for the trading loop.
+
+`MetaTrader5` is not thread-safe, so every call into it goes through one
+dedicated worker thread (`call_mt5`). Everything else is moved off that thread
+so it can overlap with terminal I/O:
+
+- `trade_decision` runs on a separate compute thread while the MT5 thread
+  is busy with early exits.
+- Telegram posts go to their own pool instead of blocking order handling.
+- Stopping the bot (Ctrl+C, SIGTERM or `stop()`) cancels the cycle. The
+  in-flight MT5 call is allowed to finish, queued alerts are flushed, and
+  then the terminal is shut down.
+"""
+
+import asyncio
+import functools
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+import MetaTrader5 as mt5
+
+from services.execution import execute_signal, review_positions
+from services.mt5_client import (
+    fetch_price_history,
+    get_account_info,
+    initialize_mt5,
+    shutdown_mt5,
+)
+from services.mt5_journal import note
+from strategies.supertrend_strategy import trade_decision
+from utils.telegram_alert import set_alert_dispatcher
+from utils.trade_logger import log
+from utils.trade_tracker import close_state, load_last_trade_time, save_last_trade_time
+
+
+class BotRuntime:
+    def __init__(self, symbol, interval=60):
+        self.symbol = symbol
+        self.interval = interval
+        self.balance = None
+        self.last_trade_candle_time = None
+        self._mt5 = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
+        self._compute = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compute")
+        self._notify = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify")
+        self._stop = None
+
+    def call_mt5(self, func, *args, **kwargs):
+        """
+        Queue `func` on the MT5 thread and return an awaitable for its result.
+        Anything touching `mt5` must go through here; calls run in submit order.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._mt5, functools.partial(func, *args, **kwargs))
+
+    async def compute(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._compute, functools.partial(func, *args, **kwargs)
+        )
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def start(self, login, password, server):
+        if not await self.call_mt5(initialize_mt5, login=login, password=password, server=server):
+            log("❌ MT5 initialization failed.")
+            return False
+
+        account = await self.call_mt5(get_account_info)
+        if not account:
+            log("❌ Could not fetch account info.")
+            return False
+
+        self.balance = account["balance"]
+        log(f"📈 Account Balance: ${self.balance:.2f}")
+        self.last_trade_candle_time = self.load_state()
+        last = self.last_trade_candle_time
+        note(
+            "start",
+            {"symbol": self.symbol, "last_trade_candle_time": last.isoformat() if last else None},
+        )
+        return True
+
+    def load_state(self):
+        return load_last_trade_time(self.symbol)
+
+    def save_state(self, candle_time):
+        save_last_trade_time(candle_time, self.symbol)
+
+    async def cycle(self):
+        """One pass: early exits and the M5 decision overlap, then the order (if any)."""
+        # The M5 fetch is queued ahead of the early-exit review, so the indicator
+        # math runs on the compute thread while the terminal handles positions.
+        prices = self.call_mt5(
+            fetch_price_history, self.symbol, count=150, timeframe=mt5.TIMEFRAME_M5
+        )
+        review = self.call_mt5(review_positions, self.symbol)
+        decision = asyncio.create_task(self._decide(prices))
+        try:
+            book = await review
+            df, (signal, stop_loss_price, take_profit_points) = await decision
+        finally:
+            decision.cancel()
+
+        if df is None:
+            return
+
+        latest_candle_time = df.index[-1].to_pydatetime()
+        note(
+            "decision",
+            {
+                "candle": latest_candle_time.isoformat(),
+                "signal": signal,
+                "stop_loss": stop_loss_price,
+                "take_profit": take_profit_points,
+            },
+        )
+
+        if signal and stop_loss_price and take_profit_points:
+            result = await self.call_mt5(
+                execute_signal,
+                self.symbol,
+                signal,
+                stop_loss_price,
+                take_profit_points,
+                current_price=df["close"].iloc[-1],
+                latest_atr=df["atr"].iloc[-1],
+                balance=self.balance,
+                book=book,
+            )
+            note("order", {"candle": latest_candle_time.isoformat(), "order": result.order if result else None})
+            if result:
+                self.last_trade_candle_time = latest_candle_time
+                self.save_state(latest_candle_time)
+        else:
+            log("⏱ No valid signal this cycle.")
+
+    async def _decide(self, prices):
+        df = await prices
+        if df is None or df.empty or len(df) < 30:
+            log("⚠️ Not enough price data. Retrying next cycle.")
+            return None, (None, None, None)
+
+        latest_candle_time = df.index[-1].to_pydatetime()
+        if self.last_trade_candle_time == latest_candle_time:
+            log(f"⏩ Already traded on candle at {latest_candle_time}. Skipping.\n")
+            return None, (None, None, None)
+
+        return df, await self.compute(trade_decision, df)
+
+    async def run(self, login, password, server, cycles=None):
+        """
+        Connect and trade until stopped; `cycles` bounds the loop for benchmarks.
+        Returns False if the terminal connection could not be set up.
+        """
+        self._stop = asyncio.Event()
+        self._install_signal_handlers()
+        set_alert_dispatcher(self._notify.submit)
+        try:
+            if not await self.start(login, password, server):
+                return False
+            done = 0
+            while not self._stop.is_set() and (cycles is None or done < cycles):
+                await self.cycle()
+                done += 1
+                if self.interval:
+                    log(f"🕒 Waiting {self.interval}s for next check...")
+                    log("-" * 50 + "\n")
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+                    except asyncio.TimeoutError:
+                        pass
+        except asyncio.CancelledError:
+            log("🛑 Bot stopped manually.")
+        finally:
+            await self.shutdown()
+        return True
+
+    async def shutdown(self):
+        set_alert_dispatcher(None)
+        # Let the in-flight MT5 call finish before disconnecting on the same thread.
+        await asyncio.shield(self.call_mt5(shutdown_mt5))
+        self._notify.shutdown(wait=True)
+        self._compute.shutdown(wait=True)
+        self._mt5.shutdown(wait=True)
+        close_state()
+        log("🔒 Disconnected from MT5.")
+
+    def _install_signal_handlers(self):
+        # asyncio.run already turns Ctrl+C into cancellation of the main task;
+        # SIGTERM needs a handler, which the Windows event loop doesn't support.
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.stop)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass
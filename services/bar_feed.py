@@ -0,0 +1,387 @@
+"""
+Shared-memory bar feed: one MT5 reader, any number of strategy processes.
+
+The feed process is the only one with a terminal connection. It polls bars
+and the latest tick and publishes them into a `multiprocessing.shared_memory`
+ring (`BarRing`). Strategy workers attach to the ring by name, read bars
+straight out of shared memory, and put their signals on a queue. Adding a
+strategy therefore adds no terminal load.
+
+Ring layout: a small header (sequence counter, bar count, last tick,
+publish stamp, feed stats) followed by `2 * capacity` bar slots. Every bar is written
+twice, at slot i and i + capacity, so the latest `n <= capacity` bars are
+always one contiguous slice and can be handed out as a view without copying.
+There is one writer and no locks. The writer makes the sequence counter odd
+while it writes and even again when done (a seqlock). Readers retry if the
+counter was odd or changed while they were reading.
+"""
+
+import importlib
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.latency import now_ns, summarize
+
+BAR_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+HEADER_DTYPE = np.dtype(
+    [
+        ("seq", "<u8"),
+        ("count", "<u8"),
+        ("capacity", "<u8"),
+        ("publish_ns", "<i8"),
+        ("tick_msc", "<i8"),
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+        ("closed", "<u8"),
+        ("terminal_calls", "<u8"),
+    ]
+)
+
+DEFAULT_CAPACITY = 4096
+POLL_INTERVAL = 0.25  # seconds between terminal polls in the feed process
+READER_SPIN = 0.0005  # seconds between sequence checks in readers
+STALL_TIMEOUT = 2.0  # seconds a publish may stay in progress before the writer counts as dead
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no `track`
+        # Workers are spawned by the hub and share its resource tracker, so the
+        # duplicate registration is harmless and the hub's unlink clears it.
+        return shared_memory.SharedMemory(name=name)
+
+
+class BarRing:
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)[0:1]
+        capacity = int(self.header["capacity"][0])
+        self.capacity = capacity
+        self.bars = np.ndarray(
+            (2 * capacity,), dtype=BAR_DTYPE, buffer=shm.buf, offset=HEADER_DTYPE.itemsize
+        )
+
+    @classmethod
+    def create(cls, name=None, capacity=DEFAULT_CAPACITY):
+        size = HEADER_DTYPE.itemsize + 2 * capacity * BAR_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+        header[:] = 0
+        header["capacity"] = capacity
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # --- writer side (feed process only) ---
+
+    def publish(self, rates, tick=None):
+        """Append new bars / update the forming bar from `rates` (oldest first)."""
+        h = self.header
+        count = int(h["count"][0])
+        last_time = int(self.bars[(count - 1) % self.capacity]["time"]) if count else -1
+
+        h["seq"] += 1  # odd: write in progress
+        if rates is not None and len(rates):
+            fresh = rates[rates["time"] >= last_time]
+            for bar in fresh:
+                if int(bar["time"]) == last_time:
+                    i = count - 1
+                else:
+                    i = count
+                    count += 1
+                slot = i % self.capacity
+                self.bars[slot] = bar
+                self.bars[slot + self.capacity] = bar
+                last_time = int(bar["time"])
+            h["count"] = count
+        if tick is not None:
+            h["tick_msc"] = tick.time_msc
+            h["bid"] = tick.bid
+            h["ask"] = tick.ask
+        h["publish_ns"] = now_ns()
+        h["seq"] += 1  # even: consistent again
+
+    def close_feed(self):
+        """Tell readers no more data is coming."""
+        self.header["seq"] += 1
+        self.header["closed"] = 1
+        self.header["seq"] += 1
+
+    # --- reader side ---
+
+    @property
+    def seq(self):
+        return int(self.header["seq"][0])
+
+    @property
+    def closed(self):
+        return bool(self.header["closed"][0])
+
+    def wait(self, last_seq, timeout=None):
+        """Spin until a complete publish newer than `last_seq`; returns its seq or None."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            seq = self.seq
+            if seq != last_seq and seq % 2 == 0:
+                return seq
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(READER_SPIN)
+
+    @property
+    def last_time(self):
+        """Open time of the newest published bar, or None before the first publish."""
+        count = int(self.header["count"][0])
+        return int(self.bars[(count - 1) % self.capacity]["time"]) if count else None
+
+    def view(self, n):
+        """Zero-copy view of the latest `n` bars; only valid while `valid(seq)` holds."""
+        count = int(self.header["count"][0])
+        n = min(n, count, self.capacity)
+        start = (count - n) % self.capacity
+        return self.bars[start:start + n]
+
+    def tick(self):
+        h = self.header
+        return int(h["tick_msc"][0]), float(h["bid"][0]), float(h["ask"][0])
+
+    def valid(self, seq):
+        return self.seq == seq
+
+    def read(self, n, consume, timeout=STALL_TIMEOUT):
+        """
+        Run `consume(view, header)` against a consistent snapshot of the latest
+        `n` bars, retrying if the writer overlapped. Returns (seq, result).
+        Raises TimeoutError if no consistent snapshot appears within `timeout`,
+        e.g. the feed died mid-publish and left the sequence odd.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = self.seq
+            if seq % 2:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"bar feed stuck mid-publish at seq {seq}")
+                time.sleep(READER_SPIN)
+                continue
+            result = consume(self.view(n), self.header[0].copy())
+            if self.valid(seq):
+                return seq, result
+
+    def close(self):
+        # Drop our numpy views before closing, or the buffer stays exported.
+        self.header = self.bars = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _CountingMT5:
+    """Module proxy that reports every `MetaTrader5` call to `on_call`."""
+
+    def __init__(self, module, on_call):
+        self._module = module
+        self._on_call = on_call
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+
+        def call(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._on_call()
+
+        call.__name__ = name
+        return call
+
+
+def run_feed(ring_name, symbol, login, password, server, stop, history=500, poll_interval=POLL_INTERVAL):
+    """Feed process: the only MT5 connection; publishes M5 bars and ticks."""
+    import sys
+
+    from services.mt5_backend import configure_from_env
+
+    ring = BarRing.attach(ring_name)
+    calls = 0
+
+    def counted():
+        nonlocal calls
+        calls += 1
+        ring.header["terminal_calls"] = calls
+
+    # Count every call (login, history, polls) before mt5_client binds the module.
+    mt5 = sys.modules["MetaTrader5"] = _CountingMT5(configure_from_env(record=False), counted)
+
+    from services.mt5_client import initialize_mt5, shutdown_mt5
+    from utils.trade_logger import log
+
+    if not initialize_mt5(login=login, password=password, server=server):
+        ring.close_feed()
+        ring.close()
+        return
+
+    bar_seconds = 5 * 60
+    try:
+        ring.publish(mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, history))
+        last_msc = None
+        while not stop.is_set():
+            tick = mt5.symbol_info_tick(symbol)
+            if tick and tick.time_msc != last_msc:
+                # Refetch from the newest published bar (it may still have been
+                # forming), so a stalled poll loop or terminal leaves no gaps.
+                last_time = ring.last_time
+                if last_time is None:
+                    count = history
+                else:
+                    count = min(history, max(0, tick.time - last_time) // bar_seconds + 2)
+                ring.publish(mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, count), tick)
+                last_msc = tick.time_msc
+            stop.wait(poll_interval)
+    finally:
+        ring.close_feed()
+        shutdown_mt5()
+        ring.close()
+        log(f"📴 Feed stopped after {calls} terminal calls.")
+
+
+def _resolve(path):
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr or "trade_decision")
+
+
+def strategy_worker(name, strategy_path, ring_name, signals, bars=150):
+    """Strategy process: reads the ring, runs `strategy(df)`, reports to `signals`."""
+    import pandas as pd
+
+    strategy = _resolve(strategy_path)
+    ring = BarRing.attach(ring_name)
+
+    def to_frame(view, header):
+        # The only copy is the one into the strategy's DataFrame.
+        df = pd.DataFrame(view)
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        return df.set_index("time"), header
+
+    seen = 0
+    try:
+        while True:
+            if ring.wait(seen, timeout=1.0) is None and ring.seq % 2 == 0:
+                continue  # nothing new; an odd seq falls through to read()'s stall check
+            received_ns = now_ns()
+            if ring.closed:
+                break
+            seen, (df, header) = ring.read(bars, to_frame)
+            if len(df) < 30:
+                continue
+
+            signal, stop_loss, take_profit = strategy(df)
+            signals.put(
+                {
+                    "strategy": name,
+                    "seq": seen,
+                    "candle": df.index[-1].isoformat(),
+                    "signal": signal,
+                    "stop_loss": stop_loss,
+                    "take_profit": take_profit,
+                    "fanout_ms": (received_ns - int(header["publish_ns"])) / 1e6,
+                    "decision_ms": (now_ns() - received_ns) / 1e6,
+                }
+            )
+    except TimeoutError as e:
+        from utils.trade_logger import log
+
+        log(f"❌ Strategy {name} stopped: {e}")
+    finally:
+        ring.close()
+
+
+class FeedHub:
+    """Owns the ring, the feed process and the strategy pool; collects their signals."""
+
+    def __init__(self, symbol, strategies, capacity=DEFAULT_CAPACITY):
+        self.symbol = symbol
+        self.strategies = strategies  # {name: "module:function"}
+        self.capacity = capacity
+        self.fanout_ms = {name: [] for name in strategies}
+        self._ctx = mp.get_context("spawn")
+        self._signals = self._ctx.Queue()
+        self._stop = self._ctx.Event()
+        self._procs = []
+        self.ring = None
+
+    def start(self, login, password, server, poll_interval=POLL_INTERVAL):
+        from utils.trade_logger import log
+
+        self.ring = BarRing.create(capacity=self.capacity)
+        for name, path in self.strategies.items():
+            self._spawn(strategy_worker, f"strategy-{name}", name, path, self.ring.name, self._signals)
+        self._spawn(
+            run_feed,
+            "feed",
+            self.ring.name,
+            self.symbol,
+            login,
+            password,
+            server,
+            self._stop,
+            poll_interval=poll_interval,
+        )
+        log(f"📡 Bar feed for {self.symbol} started with {len(self.strategies)} strategies.")
+
+    def _spawn(self, target, name, *args, **kwargs):
+        proc = self._ctx.Process(target=target, args=args, kwargs=kwargs, name=name, daemon=True)
+        proc.start()
+        self._procs.append(proc)
+
+    def signals(self, timeout=1.0):
+        """Yield strategy reports as they arrive; stops after `timeout` of silence."""
+        while True:
+            try:
+                report = self._signals.get(timeout=timeout)
+            except queue.Empty:
+                return
+            self.fanout_ms[report["strategy"]].append(report["fanout_ms"])
+            yield report
+
+    def terminal_calls(self):
+        """MT5 calls made by the feed so far — independent of the number of strategies."""
+        return int(self.ring.header["terminal_calls"][0]) if self.ring else 0
+
+    def latency_summary(self):
+        return summarize(self.fanout_ms)
+
+    def stop(self):
+        self._stop.set()
+        for proc in self._procs:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
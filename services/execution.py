@@ -0,0 +1,181 @@
+import time
+
+import MetaTrader5 as mt5
+
+from services.mt5_client import close_one_trade, get_contract_size, place_order
+from services.position_book import PositionBook
+from utils.early_exit import should_exit_early
+from utils.risk import calculate_lot_size, get_dynamic_min_tp_dollars
+from utils.trade_logger import log, log_trade
+from utils.trade_tracker import (
+    add_bot_ticket,
+    get_bot_tickets,
+    get_counter,
+    increment_counter,
+    prune_bot_tickets,
+)
+
+# Swapped for a no-op when replaying a journal (services.mt5_journal).
+sleep = time.sleep
+
+
+def manage_early_exits(symbol, book=None, max_loss=5.0):
+    """
+    Close positions that are losing more than `max_loss` and confirmed against us on M1.
+    Returns how many positions were closed.
+    """
+    if book is None:
+        book = PositionBook.load(symbol)
+
+    confirmed = {}  # the M1 check only depends on direction, fetch it once per side
+    closed = 0
+    for i in book.losing_more_than(max_loss, symbol=symbol):
+        pos = book.positions[i]
+        trade_type = "BUY" if pos.type == mt5.ORDER_TYPE_BUY else "SELL"
+        unrealized_loss = -book.pnl[i]
+
+        # 🛑 Check for early loss exit
+        if trade_type not in confirmed:
+            confirmed[trade_type] = should_exit_early(
+                symbol, trade_type, bars=5, timeframe=mt5.TIMEFRAME_M1
+            )
+        if confirmed[trade_type]:
+            log(
+                f"⚠️ Early exit triggered: {trade_type} position moving against us "
+                f"(5 candles confirmed) | Loss: ${unrealized_loss:.2f}"
+            )
+            if close_one_trade(symbol=symbol, target_type=pos.type):
+                closed += 1
+
+    # # ✅ Check if held over 1 hour and in profit
+    # held = (time.time() - book.time) >= 3600
+    # for i in np.flatnonzero(book.mask(symbol=symbol) & held & (book.pnl > 0)):
+    #     pos = book.positions[i]
+    #     log(
+    #         f"💰 Closing profitable trade held for over 1 hour | Profit: ${book.pnl[i]:.2f}"
+    #     )
+    #     close_one_trade(symbol=symbol, target_type=pos.type)
+
+    return closed
+
+
+def review_positions(symbol):
+    """
+    Load the position book for every symbol, log its exposure and run early exits.
+    Returns a book that reflects any positions closed along the way.
+    """
+    book = PositionBook.load()
+    stats = book.summary()
+    log(
+        f"📒 Open positions: {stats['positions']} | Unrealized P/L: ${stats['unrealized_pnl']:.2f} | "
+        f"Net exposure: ${stats['net_exposure']:.2f} | Margin: ${stats['margin']:.2f}"
+    )
+
+    # Positions the bot opened that the server has since closed (SL/TP hit).
+    # A failed load says nothing about which are still open, so keep them all.
+    if not book.ok:
+        log("⚠️ Could not load open positions. Keeping bot tickets as they are.")
+    gone = prune_bot_tickets(book.ticket.tolist()) if book.ok else ()
+    if gone:
+        increment_counter("positions_closed_by_server", len(gone))
+        log(f"🎯 {len(gone)} bot position(s) closed by SL/TP: {', '.join(f'#{t}' for t in sorted(gone))}")
+    log(
+        f"🤖 Bot positions open: {len(get_bot_tickets())} | Orders placed: {get_counter('orders_placed')} | "
+        f"Closed by bot: {get_counter('positions_closed')} | Closed by SL/TP: {get_counter('positions_closed_by_server')}"
+    )
+
+    if manage_early_exits(symbol, book=book):
+        book = PositionBook.load()
+    return book
+
+
+def execute_signal(
+    symbol,
+    signal,
+    stop_loss_price,
+    take_profit_points,
+    current_price,
+    latest_atr,
+    balance,
+    risk_dollars=10.0,
+    book=None,
+):
+    """
+    Flip out of one opposite position (if any) and place the new order.
+    Returns the order result on success, otherwise None.
+    """
+    # Lot size and TP value both depend on it; guessing would mis-size the order.
+    contract_size = get_contract_size(symbol)
+    if contract_size is None:
+        log(f"⚠️ Contract size for {symbol} unavailable. Skipping order.")
+        return None
+
+    if book is None:
+        book = PositionBook.load(symbol)
+
+    opposite_type = "SELL" if signal == "BUY" else "BUY"
+    opposite_trades = book.select(book.mask(symbol=symbol, order_type=opposite_type))
+
+    if opposite_trades:
+        log(f"🔁 {len(opposite_trades)} opposite trades found. Closing one...")
+        success = close_one_trade(symbol=symbol, target_type=opposite_trades[0].type)
+        if not success:
+            log("❌ Failed to close. Retrying in 2s.")
+            sleep(2)
+            close_one_trade(symbol=symbol, target_type=opposite_trades[0].type)
+        sleep(1)
+    else:
+        log("✅ No opposite trades. Proceeding with new order...")
+
+    sl_distance = abs(current_price - stop_loss_price)
+    sl_distance = max(sl_distance, 1.0)  # Enforce minimum SL
+
+    volume = calculate_lot_size(
+        sl_points=sl_distance, risk_dollars=risk_dollars, contract_size=contract_size
+    )
+    if volume <= 0:
+        log("⚠️ Invalid lot size. Skipping.")
+        return None
+
+    # 💡 Calculate dynamic TP validation threshold
+    min_tp_dollars = get_dynamic_min_tp_dollars(
+        latest_atr, volume, contract_size=contract_size
+    )
+    tp_value = take_profit_points * contract_size * volume
+
+    if tp_value < min_tp_dollars and tp_value < 2.0:
+        log(
+            f"⚠️ TP too small (${tp_value:.2f} < ${min_tp_dollars:.2f}). Skipping...",
+        )
+        return None
+
+    log(
+        f"📥 Placing {signal} order | Price: {current_price:.2f} | SL: {stop_loss_price:.2f} | TP: {current_price + take_profit_points:.2f} | Vol: {volume:.2f}"
+    )
+    result = place_order(
+        symbol,
+        signal,
+        volume=volume,
+        sl_points=sl_distance,
+        tp_points=take_profit_points,
+    )
+
+    if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+        log(f"✅ Order placed successfully: #{result.order}")
+        add_bot_ticket(result.order)
+        increment_counter("orders_placed")
+        log_trade(
+            order_type=signal,
+            price=current_price,
+            stop_loss=stop_loss_price,
+            take_profit=take_profit_points,
+            lot_size=volume,
+            order_id=result.order,
+            balance=balance,
+        )
+        return result
+
+    log(
+        f"❌ Order placement failed: {result.retcode if result else None} - {result.comment if result else 'No result'}"
+    )
+    return None
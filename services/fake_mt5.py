@@ -0,0 +1,377 @@
+"""
+In-process stand-in for the `MetaTrader5` package.
+
+The real package only runs on Windows next to a terminal. This module exposes
+the subset of its API the bot uses (same names, constants and return shapes),
+backed by a deterministic random-walk price series and an in-memory order book,
+so the bot can run on Linux. Call `install()` before anything imports
+`MetaTrader5`, or set `MT5_BACKEND=fake` and use `services.mt5_backend`.
+"""
+
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# --- Constants (values match the real package) ---
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+TRADE_ACTION_DEAL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_IOC = 1
+
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+_TIMEFRAME_MINUTES = {
+    TIMEFRAME_M1: 1,
+    TIMEFRAME_M5: 5,
+    TIMEFRAME_M15: 15,
+    TIMEFRAME_M30: 30,
+    TIMEFRAME_H1: 60,
+}
+
+RATES_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+
+AccountInfo = namedtuple(
+    "AccountInfo", ["login", "server", "balance", "equity", "margin", "leverage"]
+)
+SymbolInfo = namedtuple(
+    "SymbolInfo",
+    ["name", "digits", "point", "trade_contract_size", "volume_min", "volume_step"],
+)
+Tick = namedtuple("Tick", ["time", "bid", "ask", "last", "time_msc"])
+TradePosition = namedtuple(
+    "TradePosition",
+    [
+        "ticket",
+        "time",
+        "type",
+        "magic",
+        "volume",
+        "price_open",
+        "sl",
+        "tp",
+        "price_current",
+        "profit",
+        "symbol",
+        "comment",
+    ],
+)
+OrderSendResult = namedtuple(
+    "OrderSendResult", ["retcode", "deal", "order", "volume", "price", "comment"]
+)
+
+# Default symbol specs; anything else falls back to a 100-unit, 2-digit contract.
+SYMBOLS = {
+    "XAUUSD": {"digits": 2, "point": 0.01, "trade_contract_size": 100.0, "start": 2350.0, "spread": 0.20},
+    "XAGUSD": {"digits": 3, "point": 0.001, "trade_contract_size": 5000.0, "start": 29.0, "spread": 0.02},
+    "EURUSD": {"digits": 5, "point": 0.00001, "trade_contract_size": 100000.0, "start": 1.08, "spread": 0.00008},
+}
+
+# Tunables for simulations and benchmarks.
+SEED = 42
+LATENCY = 0.0  # seconds added to every API call, to mimic terminal IPC
+WEEK_MINUTES = 7 * 24 * 60
+
+_lock = threading.RLock()
+_state = {
+    "connected": False,
+    "login": None,
+    "server": None,
+    "balance": 10000.0,
+    "leverage": 100,
+    "clock": None,
+    "series": {},
+    "positions": {},
+    "next_ticket": 1,
+}
+_last_error = (1, "Success")
+
+
+def _now():
+    clock = _state["clock"]
+    return clock if clock is not None else time.time()
+
+
+def _delay():
+    if LATENCY:
+        time.sleep(LATENCY)
+
+
+def _spec(symbol):
+    spec = SYMBOLS.get(symbol)
+    if spec is None:
+        spec = {"digits": 2, "point": 0.01, "trade_contract_size": 100.0, "start": 100.0, "spread": 0.02}
+    return spec
+
+
+def _series(symbol, upto_minute):
+    """Return (first_minute, closes) for `symbol`, extended up to `upto_minute`."""
+    series = _state["series"].get(symbol)
+    if series is None:
+        # Anchor on the start of the previous week so separate processes (one
+        # per account, feed readers, ...) see the same prices.
+        first = (upto_minute // WEEK_MINUTES - 1) * WEEK_MINUTES
+        rng = np.random.default_rng([SEED, sum(map(ord, symbol))])
+        closes = _walk(rng, _spec(symbol)["start"], upto_minute - first + 1)
+        series = {"first": first, "closes": closes, "rng": rng}
+        _state["series"][symbol] = series
+
+    missing = upto_minute - (series["first"] + len(series["closes"]) - 1)
+    if missing > 0:
+        tail = _walk(series["rng"], series["closes"][-1], missing)
+        series["closes"] = np.concatenate([series["closes"], tail])
+    return series["first"], series["closes"]
+
+
+def _walk(rng, start, n):
+    steps = rng.normal(0.0, start * 0.0004, n)
+    return np.maximum(start + np.cumsum(steps), start * 0.01)
+
+
+def _current_price(symbol):
+    minute = int(_now() // 60)
+    first, closes = _series(symbol, minute)
+    return float(closes[minute - first])
+
+
+def set_time(timestamp):
+    """Pin the fake clock to `timestamp` (epoch seconds); `None` follows wall time."""
+    with _lock:
+        _state["clock"] = timestamp
+
+
+def reset(balance=10000.0, seed=None):
+    """Drop all positions and price history."""
+    global SEED
+    with _lock:
+        if seed is not None:
+            SEED = seed
+        _state.update(
+            balance=balance, series={}, positions={}, next_ticket=1, clock=None
+        )
+
+
+def install():
+    """Register this module as `MetaTrader5` so `import MetaTrader5` picks it up."""
+    sys.modules["MetaTrader5"] = sys.modules[__name__]
+    return sys.modules[__name__]
+
+
+# --- MetaTrader5 API ---
+
+
+def initialize(*args, **kwargs):
+    _delay()
+    with _lock:
+        _state["connected"] = True
+    return True
+
+
+def login(login, password=None, server=None, timeout=None):
+    _delay()
+    with _lock:
+        if not _state["connected"]:
+            return False
+        _state["login"] = login
+        _state["server"] = server
+    return True
+
+
+def shutdown():
+    with _lock:
+        _state["connected"] = False
+    return True
+
+
+def last_error():
+    return _last_error
+
+
+def account_info():
+    _delay()
+    with _lock:
+        if not _state["connected"]:
+            return None
+        floating = sum(_profit(p) for p in _state["positions"].values())
+        margin = sum(_margin(p) for p in _state["positions"].values())
+        return AccountInfo(
+            login=_state["login"],
+            server=_state["server"],
+            balance=_state["balance"],
+            equity=_state["balance"] + floating,
+            margin=margin,
+            leverage=_state["leverage"],
+        )
+
+
+def symbol_info(symbol):
+    _delay()
+    spec = _spec(symbol)
+    return SymbolInfo(
+        name=symbol,
+        digits=spec["digits"],
+        point=spec["point"],
+        trade_contract_size=spec["trade_contract_size"],
+        volume_min=0.01,
+        volume_step=0.01,
+    )
+
+
+def symbol_info_tick(symbol):
+    _delay()
+    with _lock:
+        now = _now()
+        bid = _current_price(symbol)
+        ask = bid + _spec(symbol)["spread"]
+        return Tick(time=int(now), bid=bid, ask=ask, last=bid, time_msc=int(now * 1000))
+
+
+def copy_rates_from_pos(symbol, timeframe, start_pos, count):
+    _delay()
+    minutes = _TIMEFRAME_MINUTES.get(timeframe)
+    if minutes is None or count <= 0:
+        return None
+
+    with _lock:
+        now_minute = int(_now() // 60)
+        last_bar = (now_minute // minutes - start_pos) * minutes
+        first_bar = last_bar - (count - 1) * minutes
+        first, closes = _series(symbol, now_minute)
+        if first_bar - 1 < first:
+            return None
+
+        # Bar k covers minutes [first_bar + k*minutes, ... + minutes - 1].
+        idx = np.arange(first_bar, last_bar + minutes) - first
+        idx = np.minimum(idx, now_minute - first)
+        path = closes[idx].reshape(count, minutes)
+        opens = closes[idx[::minutes] - 1]
+
+    rates = np.empty(count, dtype=RATES_DTYPE)
+    rates["time"] = (np.arange(count) * minutes + first_bar) * 60
+    rates["open"] = opens
+    rates["close"] = path[:, -1]
+    rates["high"] = np.maximum(path.max(axis=1), opens)
+    rates["low"] = np.minimum(path.min(axis=1), opens)
+    rates["tick_volume"] = 100 * minutes
+    rates["spread"] = 20
+    rates["real_volume"] = 0
+    return rates
+
+
+def _profit(pos):
+    price = _current_price(pos["symbol"])
+    direction = 1.0 if pos["type"] == POSITION_TYPE_BUY else -1.0
+    size = _spec(pos["symbol"])["trade_contract_size"]
+    return (price - pos["price_open"]) * direction * pos["volume"] * size
+
+
+def _margin(pos):
+    size = _spec(pos["symbol"])["trade_contract_size"]
+    return pos["price_open"] * pos["volume"] * size / _state["leverage"]
+
+
+def _as_position(pos):
+    price = _current_price(pos["symbol"])
+    if pos["type"] == POSITION_TYPE_SELL:
+        price += _spec(pos["symbol"])["spread"]
+    return TradePosition(
+        ticket=pos["ticket"],
+        time=pos["time"],
+        type=pos["type"],
+        magic=pos["magic"],
+        volume=pos["volume"],
+        price_open=pos["price_open"],
+        sl=pos["sl"],
+        tp=pos["tp"],
+        price_current=price,
+        profit=round(_profit(pos), 2),
+        symbol=pos["symbol"],
+        comment=pos["comment"],
+    )
+
+
+def positions_get(symbol=None, ticket=None, group=None):
+    _delay()
+    with _lock:
+        if not _state["connected"]:
+            return None
+        return tuple(
+            _as_position(p)
+            for p in _state["positions"].values()
+            if (symbol is None or p["symbol"] == symbol)
+            and (ticket is None or p["ticket"] == ticket)
+        )
+
+
+def order_calc_margin(action, symbol, volume, price):
+    _delay()
+    size = _spec(symbol)["trade_contract_size"]
+    return round(price * volume * size / _state["leverage"], 2)
+
+
+def positions_total():
+    with _lock:
+        return len(_state["positions"])
+
+
+def order_send(request):
+    _delay()
+    with _lock:
+        symbol = request.get("symbol")
+        volume = request.get("volume", 0)
+        price = request.get("price", 0.0)
+        if not _state["connected"] or not symbol or volume <= 0:
+            return OrderSendResult(TRADE_RETCODE_INVALID, 0, 0, volume, price, "Invalid request")
+
+        ticket = _state["next_ticket"]
+        _state["next_ticket"] += 1
+
+        position_ticket = request.get("position")
+        if position_ticket:
+            pos = _state["positions"].pop(position_ticket, None)
+            if pos is None:
+                return OrderSendResult(
+                    TRADE_RETCODE_POSITION_CLOSED, 0, 0, volume, price, "Position closed"
+                )
+            _state["balance"] += _profit(pos)
+            return OrderSendResult(TRADE_RETCODE_DONE, ticket, ticket, volume, price, "Request executed")
+
+        _state["positions"][ticket] = {
+            "ticket": ticket,
+            "time": int(_now()),
+            "type": request["type"],
+            "magic": request.get("magic", 0),
+            "volume": volume,
+            "price_open": price,
+            "sl": request.get("sl", 0.0),
+            "tp": request.get("tp", 0.0),
+            "symbol": symbol,
+            "comment": request.get("comment", ""),
+        }
+        return OrderSendResult(TRADE_RETCODE_DONE, ticket, ticket, volume, price, "Request executed")
@@ -0,0 +1,36 @@
+import os
+import sys
+
+
+def configure_from_env(record=True):
+    """
+    Select the `MetaTrader5` implementation before the bot modules import it.
+
+    MT5_BACKEND=fake swaps in `services.fake_mt5` (Linux, simulations, benchmarks);
+    anything else leaves the real package in place. MT5_JOURNAL=record:<path>
+    additionally journals every call for later replay (`services.mt5_journal`).
+    Replay reruns the single-process `main.py` loop only, so the multi-account
+    and bar-feed processes pass `record=False` and ignore MT5_JOURNAL.
+    Must run before `services.mt5_client` / `utils.early_exit` are imported.
+    """
+    backend = os.getenv("MT5_BACKEND", "").lower()
+    if backend == "fake":
+        from services import fake_mt5
+
+        fake_mt5.LATENCY = float(os.getenv("FAKE_MT5_LATENCY", "0") or 0)
+        module = fake_mt5.install()
+    else:
+        import MetaTrader5
+
+        module = sys.modules["MetaTrader5"]
+
+    journal = os.getenv("MT5_JOURNAL", "")
+    if journal.startswith("record:") and not record:
+        from utils.trade_logger import log
+
+        log("⚠️ MT5_JOURNAL is only supported for main.py sessions. Not recording.")
+    elif journal.startswith("record:"):
+        from services.mt5_journal import install_recorder
+
+        module = install_recorder(module, journal[len("record:"):])
+    return module
@@ -3,11 +3,16 @@ import pandas as pd
 
 from utils.telegram_alert import send_telegram_alert
 from utils.trade_logger import close_trade, log
+from utils.trade_tracker import increment_counter, remove_bot_ticket
 
+# Symbol specs (digits, contract size, ...) don't change during a session.
+_symbol_info_cache = {}
 
-def initialize_mt5(login, password, server):
+
+def initialize_mt5(login, password, server, path=None):
+    """`path` picks the terminal executable; each concurrent login needs its own."""
     mt5.shutdown()
-    if not mt5.initialize():
+    if not (mt5.initialize(path=path) if path else mt5.initialize()):
         log("❌ Failed to initialize MetaTrader 5.")
         return False
     authorized = mt5.login(login, password=password, server=server)
@@ -34,6 +39,21 @@ def get_account_info():
     return None
 
 
+def get_symbol_info(symbol):
+    info = _symbol_info_cache.get(symbol)
+    if info is None:
+        info = mt5.symbol_info(symbol)
+        if info:
+            _symbol_info_cache[symbol] = info
+    return info
+
+
+def get_contract_size(symbol):
+    """Units per lot for `symbol`, or None when the terminal has no symbol info."""
+    info = get_symbol_info(symbol)
+    return info.trade_contract_size if info else None
+
+
 def fetch_price_history(symbol, count=300, timeframe=mt5.TIMEFRAME_M5):
     rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
     if rates is None:
@@ -51,7 +71,7 @@ def place_order(symbol, signal, volume, sl_points, tp_points=0):
         log("❌ Failed to retrieve current price.")
         return None
 
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = get_symbol_info(symbol)
     if not symbol_info:
         log("❌ Failed to retrieve symbol info.")
         return None
@@ -144,8 +164,13 @@ def close_all_trades(opposite_type, symbol="XAUUSD"):
         result = mt5.order_send(request)
         if result.retcode == mt5.TRADE_RETCODE_DONE:
             log(f"✅ Closed position #{pos.ticket} at price {price}")
+            remove_bot_ticket(pos.ticket)
+            increment_counter("positions_closed")
             close_trade(
-                order_id=pos.ticket, close_price=price, reason="Mass Close - New Signal"
+                order_id=pos.ticket,
+                close_price=price,
+                reason="Mass Close - New Signal",
+                contract_size=get_contract_size(symbol),
             )
         else:
             log(f"❌ Failed to close position #{pos.ticket}: {result.comment}")
@@ -189,10 +214,13 @@ def close_one_trade(symbol, target_type):
 
         result = mt5.order_send(request)
         if result.retcode == mt5.TRADE_RETCODE_DONE:
+            remove_bot_ticket(pos.ticket)
+            increment_counter("positions_closed")
             close_trade(
                 order_id=pos.ticket,
                 close_price=price,
                 reason="Trend Reversal - Signal Flip",
+                contract_size=get_contract_size(symbol),
             )
             order_message = f"✅ Closed position #{pos.ticket} at {price:.2f}"
             log(order_message)
@@ -0,0 +1,381 @@
+"""
+Record-and-replay journal of `MetaTrader5` API traffic.
+
+Recording: set MT5_JOURNAL=record:<path> (handled by `services.mt5_backend`).
+Only single-process `main.py` sessions are recorded and replayed; the
+multi-account coordinator, its executors and the bar feed ignore MT5_JOURNAL.
+Every call through the `mt5` module is appended to a binary journal: name,
+arguments, response, wall-clock timestamp and duration. The bot logs its
+decisions into the same stream with `note()`.
+
+Replaying:
+
+    python -m services.mt5_journal replay <path> [--symbol XAUUSD]
+
+The recorded responses are fed back to the full bot with no waits. At the end
+a report lists every divergence from the recording, such as a different
+decision or a different `order_send` request.
+
+File layout: the magic bytes, then one frame per record. A frame is a
+little-endian u32 length followed by a pickled tuple
+(kind, name, args, kwargs, result, wall_ns, duration_ns).
+"""
+
+import argparse
+import atexit
+import collections
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+
+MAGIC = b"MT5J\x01"
+_LEN = struct.Struct("<I")
+_FLUSH_EVERY = 256  # records between flushes while recording
+
+# Calls whose arguments are environment-specific (credentials, paths) and are
+# not compared on replay. Passwords are never written to the journal.
+_UNCHECKED = {"initialize", "login", "shutdown", "last_error"}
+_REDACTED = {"password"}
+
+_active = None
+
+
+class JournalExhausted(Exception):
+    """Raised on replay once the bot asks for more than was recorded."""
+
+
+def note(kind, payload):
+    """Log a bot-level event (decision, order outcome) into the active journal."""
+    if _active is not None:
+        _active.note(kind, payload)
+
+
+def _freeze(value):
+    """Turn MT5 result objects into plain, picklable data."""
+    if hasattr(value, "_asdict"):
+        fields = value._asdict()
+        return ("__nt__", type(value).__name__, tuple(fields), tuple(_freeze(v) for v in fields.values()))
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, list):
+        return [_freeze(v) for v in value]
+    return value
+
+
+_nt_types = {}
+
+
+def _thaw(value):
+    if isinstance(value, tuple):
+        if len(value) == 4 and value[0] == "__nt__":
+            _, name, fields, values = value
+            cls = _nt_types.get((name, fields))
+            if cls is None:
+                cls = _nt_types[(name, fields)] = collections.namedtuple(name, fields)
+            return cls(*(_thaw(v) for v in values))
+        return tuple(_thaw(v) for v in value)
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _comparable(value):
+    """Normalize arguments/payloads so float noise doesn't count as divergence."""
+    if isinstance(value, float):
+        return round(float(value), 8)
+    if isinstance(value, dict):
+        return {k: _comparable(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return tuple(_comparable(v) for v in value)
+    if hasattr(value, "item"):  # numpy scalars
+        return _comparable(value.item())
+    return value
+
+
+def read_journal(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an MT5 journal")
+        records = []
+        while True:
+            head = f.read(_LEN.size)
+            if len(head) < _LEN.size:
+                break
+            (size,) = _LEN.unpack(head)
+            body = f.read(size)
+            if len(body) < size:
+                break  # torn final frame from a crash
+            records.append(pickle.loads(body))
+    return records
+
+
+class RecordingMT5:
+    """Module proxy: forwards to the real `MetaTrader5` and journals every call."""
+
+    def __init__(self, module, path):
+        self._module = module
+        self._file = open(path, "wb", buffering=1 << 20)
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._wrapped = {}
+        constants = {
+            k: v
+            for k, v in vars(module).items()
+            if not k.startswith("_") and isinstance(v, (int, float, str))
+        }
+        self._write(("meta", "constants", (), {}, constants, time.time_ns(), 0))
+        atexit.register(self.close)
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+        wrapped = self._wrapped.get(name)
+        if wrapped is None:
+            wrapped = self._wrapped[name] = self._wrap(name, attr)
+        return wrapped
+
+    def _wrap(self, name, func):
+        def call(*args, **kwargs):
+            wall = time.time_ns()
+            start = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter_ns() - start
+            logged = {k: ("***" if k in _REDACTED else v) for k, v in kwargs.items()}
+            self._write(("call", name, args, logged, _freeze(result), wall, duration))
+            return result
+
+        call.__name__ = name
+        return call
+
+    def note(self, kind, payload):
+        self._write(("note", kind, (), {}, payload, time.time_ns(), 0))
+
+    def _write(self, record):
+        body = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(_LEN.pack(len(body)))
+            self._file.write(body)
+            self._pending += 1
+            if self._pending >= _FLUSH_EVERY:
+                self._file.flush()
+                self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayMT5:
+    """
+    Module stand-in that answers from a journal and notes every divergence.
+
+    Calls and notes are consumed as two separate streams. Notes are written from
+    the event loop while calls run on the MT5 thread, so their relative order in
+    the file is not meaningful.
+    """
+
+    def __init__(self, path, resync_window=64):
+        records = read_journal(path)
+        self._constants = records[0][4] if records and records[0][0] == "meta" else {}
+        self._streams = {
+            "call": [r for r in records if r[0] == "call"],
+            "note": [r for r in records if r[0] == "note"],
+        }
+        self._cursor = {"call": 0, "note": 0}
+        # Past this index only unchecked calls (shutdown etc.) remain.
+        self._last_checked = max(
+            (i for i, r in enumerate(self._streams["call"]) if r[1] not in _UNCHECKED),
+            default=-1,
+        )
+        self._resync_window = resync_window
+        self.divergences = []
+        self.derailed = False
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._constants:
+            return self._constants[name]
+
+        def call(*args, **kwargs):
+            return self._answer(name, args, kwargs)
+
+        call.__name__ = name
+        return call
+
+    def recorded_notes(self, kind):
+        return [r[4] for r in self._streams["note"] if r[1] == kind]
+
+    def _next(self, stream, name):
+        """
+        Take the next `name` record from `stream`. Records skipped on the way
+        (bounded by the resync window) are reported as missing.
+        """
+        records = self._streams[stream]
+        pos = self._cursor[stream]
+        for i in range(pos, min(len(records), pos + self._resync_window)):
+            if records[i][1] == name:
+                for missed in records[pos:i]:
+                    self._diverge("missing", missed[1], expected=missed[2] or missed[4], actual=None)
+                self._cursor[stream] = i + 1
+                return records[i]
+        return None
+
+    def _exhausted(self):
+        return self._cursor["call"] > self._last_checked
+
+    def _answer(self, name, args, kwargs):
+        if self._exhausted() and name not in _UNCHECKED:
+            raise JournalExhausted(name)
+        if self._cursor["call"] >= len(self._streams["call"]):
+            return True if name == "shutdown" else None
+
+        record = self._next("call", name)
+        if record is None:
+            if name in _UNCHECKED:
+                return True if name == "shutdown" else None
+            # The bot has left the recorded path; there is nothing left to answer with.
+            self._diverge("unexpected", name, expected=None, actual=args)
+            self.derailed = True
+            raise JournalExhausted(name)
+
+        if name not in _UNCHECKED:
+            logged = {k: ("***" if k in _REDACTED else v) for k, v in kwargs.items()}
+            if _comparable((args, logged)) != _comparable((record[2], record[3])):
+                self._diverge(
+                    "arguments", name, expected=(record[2], record[3]), actual=(args, logged)
+                )
+        return _thaw(record[4])
+
+    def note(self, kind, payload):
+        record = self._next("note", kind)
+        if record is None:
+            self._diverge("unexpected", kind, expected=None, actual=payload)
+            return
+        if _comparable(payload) != _comparable(record[4]):
+            self._diverge("changed", kind, expected=record[4], actual=payload)
+
+    def _diverge(self, reason, name, expected, actual):
+        self.divergences.append(
+            {
+                "at": self._cursor["call"],
+                "reason": reason,
+                "name": name,
+                "expected": expected,
+                "actual": actual,
+            }
+        )
+
+    def report(self):
+        calls, notes = self._streams["call"], self._streams["note"]
+        lines = [
+            f"Replayed {self._cursor['call']}/{len(calls)} MT5 calls and "
+            f"{self._cursor['note']}/{len(notes)} bot events.",
+        ]
+        if not self.divergences:
+            lines.append("✅ No divergence from the recording.")
+        for d in self.divergences:
+            lines.append(
+                f"❗ call #{d['at']} {d['reason']} [{d['name']}]\n"
+                f"    recorded: {_comparable(d['expected'])!r}\n"
+                f"    replayed: {_comparable(d['actual'])!r}"
+            )
+        if self.derailed:
+            lines.append(
+                f"⛔ Replay stopped at call #{self._cursor['call']}: the bot made a call "
+                f"the recording has no answer for."
+            )
+        return "\n".join(lines)
+
+
+def install_recorder(module, path):
+    global _active
+    _active = RecordingMT5(module, path)
+    sys.modules["MetaTrader5"] = _active
+    return _active
+
+
+def install_replayer(path):
+    global _active
+    _active = ReplayMT5(path)
+    sys.modules["MetaTrader5"] = _active
+    return _active
+
+
+def _replay_runtime(replayer, symbol):
+    """A `BotRuntime` whose persisted state comes from the journal, not from disk."""
+    from services.async_runtime import BotRuntime
+
+    starts = replayer.recorded_notes("start")
+    recorded = starts[0].get("last_trade_candle_time") if starts else None
+
+    class ReplayRuntime(BotRuntime):
+        def load_state(self):
+            return datetime.fromisoformat(recorded) if recorded else None
+
+        def save_state(self, candle_time):
+            pass
+
+    return ReplayRuntime(symbol, interval=0)
+
+
+def replay(path, symbol="XAUUSD"):
+    """Rerun the bot against a recorded journal as fast as possible; returns the replayer."""
+    import asyncio
+
+    replayer = install_replayer(path)
+
+    from services import execution
+    from utils import telegram_alert, trade_logger, trade_tracker
+
+    execution.sleep = lambda seconds: None
+    # Replayed orders and closes must never reach the live Telegram chat. The
+    # runtime installs its own dispatcher, so stub the sender rather than it.
+    telegram_alert._post_telegram_alert = lambda message: None
+    # Keep replayed trades, logs and state out of the live files.
+    trade_logger.LOG_FILE = f"{path}.trades.csv"
+    trade_logger.BOT_LOG_FILE = f"{path}.log"
+    trade_tracker.STATE_FILE = f"{path}.state"
+    trade_tracker.TRACKER_FILE = None
+    if os.path.exists(trade_tracker.STATE_FILE):
+        os.remove(trade_tracker.STATE_FILE)
+
+    runtime = _replay_runtime(replayer, symbol)
+    try:
+        asyncio.run(runtime.run(login=0, password="", server=""))
+    except JournalExhausted:
+        pass
+    return replayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded MT5 journal.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("replay", help="rerun the bot against a journal and diff it")
+    rep.add_argument("path")
+    rep.add_argument("--symbol", default="XAUUSD")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    replayer = replay(args.path, symbol=args.symbol)
+    elapsed = time.perf_counter() - start
+    print(replayer.report())
+    print(f"⏱ Replay took {elapsed:.2f}s")
+    sys.exit(1 if replayer.divergences else 0)
+
+
+if __name__ == "__main__":
+    # Go through the importable module so `note()` calls made by the bot
+    # reach the journal installed here, not a second copy under __main__.
+    from services import mt5_journal
+
+    mt5_journal.main()
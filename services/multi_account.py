@@ -0,0 +1,291 @@
+"""
+One signal process, many execution accounts.
+
+`MetaTrader5` binds one terminal/login per process, and a terminal holds one
+account at a time, so every client account gets its own executor process and
+its own terminal installation (`path`); the data login needs one as well. The coordinator holds the data connection,
+computes `trade_decision` once per candle and broadcasts each cycle to all
+executors; every executor applies its own risk, manages its own positions and
+reports back how long the signal took to reach it.
+"""
+
+import json
+import multiprocessing as mp
+import queue
+import time
+from datetime import datetime
+
+from utils.latency import now_ns, summarize
+
+ACCOUNTS_FILE = "accounts.json"
+REPORT_TIMEOUT = 10.0  # seconds to wait for executor reports after a broadcast
+STARTUP_TIMEOUT = 60.0  # seconds for every executor to log in before trading starts
+
+
+def load_accounts(path=ACCOUNTS_FILE):
+    """
+    Read the executor accounts: a JSON list of
+    {"login": 123, "password": "...", "server": "...",
+     "path": "C:/MT5/acc123/terminal64.exe", "risk_dollars": 10.0}.
+    """
+    with open(path, "r") as f:
+        accounts = json.load(f)
+    seen = set()
+    for acc in accounts:
+        acc["login"] = int(acc["login"])
+        acc.setdefault("risk_dollars", 10.0)
+        terminal = acc.get("path")
+        if not terminal:
+            raise ValueError(f"Account {acc['login']} in {path} has no terminal \"path\".")
+        if terminal in seen:
+            raise ValueError(f"Account {acc['login']} in {path} shares terminal {terminal} with another account.")
+        seen.add(terminal)
+    return accounts
+
+
+def account_worker(account, symbol, inbox, reports):
+    """Executor process: owns one MT5 login and trades the broadcast signals."""
+    from services.mt5_backend import configure_from_env
+
+    configure_from_env(record=False)
+
+    from services.execution import execute_signal, review_positions
+    from services.mt5_client import get_account_info, initialize_mt5, shutdown_mt5
+    from utils import trade_tracker
+    from utils.trade_logger import log
+
+    login = account["login"]
+    trade_tracker.STATE_FILE = f"bot_state.{login}.journal"
+    trade_tracker.TRACKER_FILE = None  # the legacy file belongs to the single-account bot
+    if not initialize_mt5(login, account["password"], account["server"], path=account["path"]):
+        reports.put({"login": login, "kind": "error", "error": "MT5 login failed"})
+        return
+
+    reports.put({"login": login, "kind": "ready"})
+    try:
+        while True:
+            msg = inbox.get()
+            if msg is None:
+                break
+            received_ns = now_ns()
+
+            book = review_positions(symbol)
+
+            order = None
+            candle_time = datetime.fromisoformat(msg["candle_time"]) if msg["candle_time"] else None
+            # Persisted per account, so a restarted executor won't re-enter a candle.
+            if msg["signal"] and candle_time != trade_tracker.load_last_trade_time(symbol):
+                acc = get_account_info()
+                result = execute_signal(
+                    symbol,
+                    msg["signal"],
+                    msg["stop_loss"],
+                    msg["take_profit"],
+                    current_price=msg["price"],
+                    latest_atr=msg["atr"],
+                    balance=acc["balance"] if acc else 0.0,
+                    risk_dollars=account["risk_dollars"],
+                    book=book,
+                )
+                if result:
+                    order = result.order
+                    trade_tracker.save_last_trade_time(candle_time, symbol)
+
+            reports.put(
+                {
+                    "login": login,
+                    "kind": "cycle",
+                    "cycle": msg["cycle"],
+                    "signal": msg["signal"],
+                    "order": order,
+                    "latency_ms": (received_ns - msg["sent_ns"]) / 1e6,
+                    "exec_ms": (now_ns() - received_ns) / 1e6,
+                }
+            )
+    finally:
+        shutdown_mt5()
+        trade_tracker.close_state()
+        log(f"🔒 Executor {login} disconnected.")
+
+
+class Coordinator:
+    """Starts the executor pool and fans each cycle's decision out to it."""
+
+    def __init__(self, symbol, accounts, report_timeout=REPORT_TIMEOUT):
+        self.symbol = symbol
+        self.accounts = accounts
+        self.report_timeout = report_timeout
+        self.latencies = {acc["login"]: [] for acc in accounts}
+        self._ctx = mp.get_context("spawn")
+        self._reports = self._ctx.Queue()
+        self._inboxes = []
+        self._workers = []
+        self._cycle = 0
+
+    def start(self):
+        from utils.trade_logger import log
+
+        for acc in self.accounts:
+            inbox = self._ctx.Queue()
+            proc = self._ctx.Process(
+                target=account_worker,
+                args=(acc, self.symbol, inbox, self._reports),
+                name=f"executor-{acc['login']}",
+                daemon=True,
+            )
+            proc.start()
+            self._inboxes.append(inbox)
+            self._workers.append(proc)
+
+        # Wait for every executor to log in. A worker that dies or hangs before
+        # reporting counts as failed instead of blocking the coordinator.
+        pending = {acc["login"]: proc for acc, proc in zip(self.accounts, self._workers)}
+        failed = 0
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                for login, proc in pending.items():
+                    log(f"❌ Executor {login}: no response after {STARTUP_TIMEOUT:.0f}s, stopping it.")
+                    proc.terminate()
+                failed += len(pending)
+                break
+            try:
+                report = self._reports.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                for login, proc in list(pending.items()):
+                    if not proc.is_alive():
+                        log(f"❌ Executor {login}: exited during startup (code {proc.exitcode}).")
+                        del pending[login]
+                        failed += 1
+                continue
+            if pending.pop(report["login"], None) is None:
+                continue
+            if report["kind"] == "error":
+                log(f"❌ Executor {report['login']}: {report['error']}")
+                failed += 1
+        log(f"👥 {len(self._workers) - failed}/{len(self._workers)} executor processes started.")
+
+    def broadcast(self, signal=None, stop_loss=None, take_profit=None, price=None, atr=None, candle_time=None):
+        """Send one cycle to every executor and wait for their reports."""
+        self._cycle += 1
+        msg = {
+            "cycle": self._cycle,
+            "candle_time": candle_time,
+            "signal": signal,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "price": price,
+            "atr": atr,
+        }
+        live = [inbox for inbox, proc in zip(self._inboxes, self._workers) if proc.is_alive()]
+        for inbox in live:
+            # A fresh dict per inbox: Queue.put pickles on a feeder thread, so
+            # mutating a shared message would race with the pickling.
+            inbox.put({**msg, "sent_ns": now_ns()})
+        return self._collect(self._cycle, len(live))
+
+    def _collect(self, cycle, expected):
+        from utils.trade_logger import log
+
+        reports = []
+        deadline = time.monotonic() + self.report_timeout
+        while len(reports) < expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log(f"⚠️ Only {len(reports)}/{expected} executors reported for cycle {cycle}.")
+                break
+            try:
+                report = self._reports.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if report.get("cycle") != cycle:
+                continue
+            reports.append(report)
+            self.latencies[report["login"]].append(report["latency_ms"])
+
+        if reports:
+            worst = max(r["latency_ms"] for r in reports)
+            orders = sum(1 for r in reports if r["order"])
+            log(
+                f"📡 Cycle {cycle}: {len(reports)} accounts | max signal latency {worst:.2f} ms | orders placed: {orders}"
+            )
+        return reports
+
+    def latency_summary(self):
+        """Per-account signal-to-executor latency: count, p50, p95 and max in ms."""
+        return summarize(self.latencies)
+
+    def stop(self):
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for proc in self._workers:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+
+
+def run_coordinator(
+    symbol, data_login, data_password, data_server, data_path, accounts, interval=60, cycles=None
+):
+    """Data connection + decision loop; `cycles=None` runs until interrupted."""
+    if not data_path or data_path in {acc["path"] for acc in accounts}:
+        raise ValueError("The data login needs its own terminal path, separate from every executor.")
+
+    from services.mt5_backend import configure_from_env
+
+    mt5 = configure_from_env(record=False)
+
+    from services.mt5_client import fetch_price_history, initialize_mt5, shutdown_mt5
+    from strategies.supertrend_strategy import trade_decision
+    from utils.trade_logger import log
+
+    if not initialize_mt5(login=data_login, password=data_password, server=data_server, path=data_path):
+        log("❌ MT5 initialization failed.")
+        return None
+
+    coordinator = Coordinator(symbol, accounts)
+    coordinator.start()
+    decided_candle, decision = None, {}
+    done = 0
+    try:
+        while cycles is None or done < cycles:
+            done += 1
+            df = fetch_price_history(symbol, count=150, timeframe=mt5.TIMEFRAME_M5)
+            if df is None or df.empty or len(df) < 30:
+                log("⚠️ Not enough price data. Retrying next cycle.")
+                coordinator.broadcast()
+                time.sleep(interval)
+                continue
+
+            # Decide once per candle; later cycles on the same candle re-send the
+            # cached decision so executors that failed to fill can retry.
+            latest_candle_time = df.index[-1].to_pydatetime()
+            if latest_candle_time != decided_candle:
+                signal, stop_loss_price, take_profit_points = trade_decision(df)
+                decided_candle, decision = latest_candle_time, {}
+                if signal and stop_loss_price and take_profit_points:
+                    decision = {
+                        "signal": signal,
+                        "stop_loss": stop_loss_price,
+                        "take_profit": take_profit_points,
+                        "price": df["close"].iloc[-1],
+                        "atr": df["atr"].iloc[-1],
+                        "candle_time": latest_candle_time.isoformat(),
+                    }
+                else:
+                    log("⏱ No valid signal this cycle.")
+
+            coordinator.broadcast(**decision)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        log("🛑 Coordinator stopped manually.")
+    finally:
+        coordinator.stop()
+        shutdown_mt5()
+        for login, stats in coordinator.latency_summary().items():
+            log(
+                f"⏱ Account {login}: {stats['count']} signals | p50 {stats['p50']:.2f} ms | "
+                f"p95 {stats['p95']:.2f} ms | max {stats['max']:.2f} ms"
+            )
+    return coordinator
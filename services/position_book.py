@@ -0,0 +1,160 @@
+"""
+Column-oriented snapshot of open positions.
+
+`PositionBook.load()` calls `positions_get` once, copies the fields into numpy
+arrays and computes per-position PnL, exposure, margin and SL/TP distances in a
+single vectorized pass using each symbol's real `trade_contract_size`. Early
+exits and entry logic read from the book instead of re-querying the terminal.
+"""
+
+import numpy as np
+import MetaTrader5 as mt5
+
+from services.mt5_client import get_contract_size
+
+_FIELDS = ("ticket", "time", "type", "volume", "price_open", "price_current", "sl", "tp")
+_DTYPE = np.dtype(
+    [
+        ("ticket", "<i8"),
+        ("time", "<i8"),
+        ("type", "<i4"),
+        ("volume", "<f8"),
+        ("price_open", "<f8"),
+        ("price_current", "<f8"),
+        ("sl", "<f8"),
+        ("tp", "<f8"),
+    ]
+)
+
+
+class PositionBook:
+    def __init__(self, positions, leverage=None):
+        # positions_get returns None on failure; the book is then empty but not "no positions".
+        self.ok = positions is not None
+        positions = positions or ()
+        rows = np.array(
+            [tuple(getattr(p, f) for f in _FIELDS) for p in positions], dtype=_DTYPE
+        )
+        self.positions = tuple(positions)
+        self.ticket = rows["ticket"]
+        self.time = rows["time"]
+        self.type = rows["type"]
+        self.volume = rows["volume"]
+        self.price_open = rows["price_open"]
+        self.price_current = rows["price_current"]
+        self.sl = rows["sl"]
+        self.tp = rows["tp"]
+
+        # Symbols as integer codes so per-symbol lookups and sums stay vectorized.
+        self.symbols, self.symbol_code = np.unique(
+            np.array([p.symbol for p in positions], dtype=object), return_inverse=True
+        )
+        self.symbols = [str(s) for s in self.symbols]
+
+        # NaN when the terminal has no contract size; those positions get NaN
+        # PnL/exposure and are left out of the totals rather than guessed.
+        contract = np.array([get_contract_size(s) for s in self.symbols], dtype=float)
+        self.contract_size = contract[self.symbol_code]
+
+        # +1 for BUY, -1 for SELL
+        self.direction = np.where(self.type == mt5.POSITION_TYPE_BUY, 1.0, -1.0)
+        self.units = self.volume * self.contract_size
+        self.pnl = (self.price_current - self.price_open) * self.direction * self.units
+        self.exposure = self.direction * self.units * self.price_current
+        self.margin = self._margin(leverage)
+
+        # Price distance left before SL / TP is hit (NaN when not set).
+        self.sl_distance = np.where(
+            self.sl > 0, self.direction * (self.price_current - self.sl), np.nan
+        )
+        self.tp_distance = np.where(
+            self.tp > 0, self.direction * (self.tp - self.price_current), np.nan
+        )
+
+    @classmethod
+    def load(cls, symbol=None):
+        positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+        account = mt5.account_info()
+        return cls(positions, leverage=account.leverage if account else None)
+
+    def __len__(self):
+        return len(self.ticket)
+
+    def _margin(self, leverage):
+        """Margin per lot from the terminal per (symbol, side), scaled by volume."""
+        per_lot = np.full(len(self.ticket), np.nan)
+        for code, symbol in enumerate(self.symbols):
+            for side in (mt5.POSITION_TYPE_BUY, mt5.POSITION_TYPE_SELL):
+                mask = (self.symbol_code == code) & (self.type == side)
+                if not mask.any():
+                    continue
+                price = float(self.price_current[mask][0])
+                calc = getattr(mt5, "order_calc_margin", None)
+                margin = calc(side, symbol, 1.0, price) if calc else None
+                if margin is not None:
+                    per_lot[mask] = margin
+
+        # Fallback when the terminal can't price it: notional / leverage.
+        missing = np.isnan(per_lot)
+        if missing.any() and leverage:
+            per_lot[missing] = (
+                self.contract_size[missing] * self.price_open[missing] / leverage
+            )
+        return np.nan_to_num(per_lot) * self.volume
+
+    def mask(self, symbol=None, order_type=None):
+        """Boolean selector; `order_type` is "BUY"/"SELL" like get_open_positions."""
+        selected = np.ones(len(self.ticket), dtype=bool)
+        if symbol is not None:
+            if symbol not in self.symbols:
+                return np.zeros(len(self.ticket), dtype=bool)
+            selected &= self.symbol_code == self.symbols.index(symbol)
+        if order_type is not None:
+            target = (
+                mt5.POSITION_TYPE_BUY if order_type == "BUY" else mt5.POSITION_TYPE_SELL
+            )
+            selected &= self.type == target
+        return selected
+
+    def select(self, selected):
+        """Original position tuples for a boolean mask."""
+        return [self.positions[i] for i in np.flatnonzero(selected)]
+
+    def losing_more_than(self, max_loss, symbol=None):
+        """Indices of positions whose unrealized loss exceeds `max_loss` dollars."""
+        return np.flatnonzero(self.mask(symbol=symbol) & (-self.pnl > max_loss))
+
+    def summary(self, symbol=None):
+        selected = self.mask(symbol=symbol)
+        return {
+            "positions": int(selected.sum()),
+            "net_volume": float((self.direction * self.volume)[selected].sum()),
+            "net_exposure": float(np.nansum(self.exposure[selected])),
+            "gross_exposure": float(np.nansum(np.abs(self.exposure[selected]))),
+            "unrealized_pnl": float(np.nansum(self.pnl[selected])),
+            "margin": float(self.margin[selected].sum()),
+            "min_sl_distance": _nanmin(self.sl_distance[selected]),
+            "min_tp_distance": _nanmin(self.tp_distance[selected]),
+        }
+
+    def per_symbol(self):
+        """Aggregates per symbol in one bincount pass per metric."""
+        n = len(self.symbols)
+        sums = {
+            "positions": np.bincount(self.symbol_code, minlength=n),
+            "net_volume": np.bincount(self.symbol_code, self.direction * self.volume, n),
+            "net_exposure": np.bincount(self.symbol_code, np.nan_to_num(self.exposure), n),
+            "gross_exposure": np.bincount(self.symbol_code, np.nan_to_num(np.abs(self.exposure)), n),
+            "unrealized_pnl": np.bincount(self.symbol_code, np.nan_to_num(self.pnl), n),
+            "margin": np.bincount(self.symbol_code, self.margin, n),
+        }
+        result = {}
+        for code, symbol in enumerate(self.symbols):
+            result[symbol] = {key: float(values[code]) for key, values in sums.items()}
+            result[symbol]["positions"] = int(sums["positions"][code])
+        return result
+
+
+def _nanmin(values):
+    values = values[~np.isnan(values)]
+    return float(values.min()) if len(values) else None
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+import pytest
+
+from services.bar_feed import BAR_DTYPE, BarRing
+
+
+def _bars(times):
+    rates = np.zeros(len(times), dtype=BAR_DTYPE)
+    rates["time"] = times
+    rates["close"] = np.arange(len(times), dtype=float)
+    return rates
+
+
+@pytest.fixture
+def ring():
+    ring = BarRing.create(capacity=8)
+    yield ring
+    ring.close()
+
+
+def test_publish_appends_and_updates_forming_bar(ring):
+    ring.publish(_bars([0, 300, 600]))
+    ring.publish(_bars([600, 900]))  # 600 re-sent while it was still forming
+    seq, times = ring.read(10, lambda view, header: view["time"].tolist())
+    assert times == [0, 300, 600, 900]
+    assert ring.last_time == 900
+    assert seq == ring.seq and seq % 2 == 0
+
+
+def test_view_stays_contiguous_after_wraparound(ring):
+    for start in range(0, 20 * 300, 300):
+        ring.publish(_bars([start]))
+    _, times = ring.read(8, lambda view, header: view["time"].tolist())
+    assert times == list(range(12 * 300, 20 * 300, 300))
+
+
+def test_read_gives_up_when_writer_died_mid_publish(ring):
+    ring.publish(_bars([0]))
+    ring.header["seq"] += 1  # a publish that never finished
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        ring.read(1, lambda view, header: None, timeout=0.05)
+    assert time.monotonic() - start < 1.0
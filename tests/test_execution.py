@@ -0,0 +1,49 @@
+import pytest
+
+from services import fake_mt5
+
+fake_mt5.install()
+
+from services import execution  # noqa: E402  (needs the fake `MetaTrader5`)
+from services.mt5_client import initialize_mt5  # noqa: E402
+from utils import telegram_alert, trade_tracker  # noqa: E402
+
+
+@pytest.fixture
+def terminal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # trade log and bot log
+    monkeypatch.setattr(trade_tracker, "STATE_FILE", str(tmp_path / "state.journal"))
+    monkeypatch.setattr(trade_tracker, "TRACKER_FILE", None)
+    monkeypatch.setattr(execution, "sleep", lambda seconds: None)
+    monkeypatch.setattr(telegram_alert, "_post_telegram_alert", lambda message: None)
+    fake_mt5.reset(seed=1)
+    initialize_mt5(1, "", "")
+    yield fake_mt5
+    trade_tracker.close_state()
+
+
+def _buy():
+    price = fake_mt5.symbol_info_tick("XAUUSD").ask
+    return execution.execute_signal("XAUUSD", "BUY", price - 10, 5.0, price, 1.0, 1000.0)
+
+
+def test_review_prunes_tickets_closed_on_the_server(terminal):
+    first, second = _buy(), _buy()
+    assert trade_tracker.get_bot_tickets() == {first.order, second.order}
+
+    del terminal._state["positions"][first.order]  # SL hit on the server
+    execution.review_positions("XAUUSD")
+
+    assert trade_tracker.get_bot_tickets() == {second.order}
+    assert trade_tracker.get_counter("positions_closed_by_server") == 1
+
+
+def test_review_keeps_tickets_when_positions_cannot_be_loaded(terminal, monkeypatch):
+    order = _buy().order
+    monkeypatch.setattr(terminal, "positions_get", lambda *args, **kwargs: None)
+
+    book = execution.review_positions("XAUUSD")
+
+    assert not book.ok
+    assert trade_tracker.get_bot_tickets() == {order}
+    assert trade_tracker.get_counter("positions_closed_by_server") == 0
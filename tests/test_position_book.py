@@ -0,0 +1,121 @@
+import math
+
+import pytest
+
+from services import fake_mt5
+
+fake_mt5.install()
+
+from services import position_book  # noqa: E402  (needs the fake `MetaTrader5`)
+from services.position_book import PositionBook  # noqa: E402
+
+BUY, SELL = fake_mt5.POSITION_TYPE_BUY, fake_mt5.POSITION_TYPE_SELL
+
+
+def _pos(ticket, symbol, type, volume, price_open, price_current, sl=0.0, tp=0.0):
+    return fake_mt5.TradePosition(
+        ticket=ticket,
+        time=1_700_000_000 + ticket,
+        type=type,
+        magic=234000,
+        volume=volume,
+        price_open=price_open,
+        sl=sl,
+        tp=tp,
+        price_current=price_current,
+        profit=0.0,
+        symbol=symbol,
+        comment="",
+    )
+
+
+def test_empty_book():
+    book = PositionBook(())
+    assert len(book) == 0
+    assert book.summary() == {
+        "positions": 0,
+        "net_volume": 0.0,
+        "net_exposure": 0.0,
+        "gross_exposure": 0.0,
+        "unrealized_pnl": 0.0,
+        "margin": 0.0,
+        "min_sl_distance": None,
+        "min_tp_distance": None,
+    }
+    assert book.per_symbol() == {}
+    assert len(book.losing_more_than(0.0)) == 0
+    assert not book.mask(symbol="XAUUSD").any()
+
+
+def test_buy_and_sell_pnl_and_exposure_signs():
+    book = PositionBook(
+        [
+            _pos(1, "XAUUSD", BUY, 0.10, 2300.0, 2310.0, sl=2290.0, tp=2330.0),
+            _pos(2, "XAUUSD", SELL, 0.20, 2300.0, 2310.0, sl=2320.0, tp=2280.0),
+        ],
+        leverage=100,
+    )
+    # 100 oz per lot: BUY gains 10 * 10 oz, SELL loses 10 * 20 oz.
+    assert book.pnl.tolist() == pytest.approx([100.0, -200.0])
+    assert book.exposure.tolist() == pytest.approx([10 * 2310.0, -20 * 2310.0])
+    assert book.sl_distance.tolist() == pytest.approx([20.0, 10.0])
+    assert book.tp_distance.tolist() == pytest.approx([20.0, 30.0])
+
+    stats = book.summary()
+    assert stats["positions"] == 2
+    assert stats["net_volume"] == pytest.approx(-0.10)
+    assert stats["net_exposure"] == pytest.approx(-10 * 2310.0)
+    assert stats["gross_exposure"] == pytest.approx(30 * 2310.0)
+    assert stats["unrealized_pnl"] == pytest.approx(-100.0)
+    assert stats["min_sl_distance"] == pytest.approx(10.0)
+    assert book.losing_more_than(150.0).tolist() == [1]
+    assert book.select(book.mask(order_type="SELL"))[0].ticket == 2
+
+
+def test_mixed_symbols_per_symbol_matches_summary():
+    book = PositionBook(
+        [
+            _pos(1, "XAUUSD", BUY, 0.10, 2300.0, 2305.0),
+            _pos(2, "EURUSD", SELL, 1.00, 1.0800, 1.0790),
+            _pos(3, "XAUUSD", BUY, 0.30, 2310.0, 2305.0),
+            _pos(4, "XAGUSD", SELL, 0.50, 29.00, 29.10),
+        ],
+        leverage=100,
+    )
+    assert book.symbols == ["EURUSD", "XAGUSD", "XAUUSD"]
+    assert book.contract_size.tolist() == [100.0, 100000.0, 100.0, 5000.0]
+
+    per_symbol = book.per_symbol()
+    for symbol in book.symbols:
+        stats = book.summary(symbol)
+        for key, value in per_symbol[symbol].items():
+            assert value == pytest.approx(stats[key]), (symbol, key)
+
+    assert per_symbol["XAUUSD"]["positions"] == 2
+    assert per_symbol["XAUUSD"]["unrealized_pnl"] == pytest.approx(50.0 - 150.0)
+    assert per_symbol["EURUSD"]["unrealized_pnl"] == pytest.approx(100.0)
+    assert per_symbol["XAGUSD"]["unrealized_pnl"] == pytest.approx(-250.0)
+    assert per_symbol["XAGUSD"]["net_exposure"] == pytest.approx(-2500 * 29.10)
+    assert book.summary("GBPUSD")["positions"] == 0
+
+
+def test_unknown_contract_size_is_left_out_of_totals(monkeypatch):
+    monkeypatch.setattr(
+        position_book, "get_contract_size", lambda symbol: None if symbol == "XAGUSD" else 100.0
+    )
+    book = PositionBook(
+        [
+            _pos(1, "XAUUSD", BUY, 0.10, 2300.0, 2310.0),
+            _pos(2, "XAGUSD", BUY, 1.00, 29.00, 25.00),
+        ],
+        leverage=100,
+    )
+    assert math.isnan(book.pnl[1]) and math.isnan(book.exposure[1])
+
+    stats = book.summary()
+    assert stats["positions"] == 2
+    assert stats["unrealized_pnl"] == pytest.approx(100.0)
+    assert stats["net_exposure"] == pytest.approx(10 * 2310.0)
+    assert book.per_symbol()["XAGUSD"]["unrealized_pnl"] == 0.0
+    # An unknown loss can't trigger an early exit.
+    assert len(book.losing_more_than(0.0)) == 0
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.state_journal import MAGIC, StateJournal, _frame
+
+
+def _journal(path, **kwargs):
+    # No background compaction unless a test asks for it.
+    kwargs.setdefault("min_compact_bytes", 1 << 40)
+    return StateJournal(str(path), sync_interval=0.001, **kwargs)
+
+
+def test_reopen_restores_state(tmp_path):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    j.set("candle", "2026-01-01T00:05:00")
+    j.add("tickets", 1)
+    j.add("tickets", 2)
+    j.discard("tickets", 1)
+    j.incr("orders", 3)
+    j.close()
+
+    j = _journal(path)
+    assert j.get("candle") == "2026-01-01T00:05:00"
+    assert j.members("tickets") == {2}
+    assert j.get("orders") == 3
+    j.close()
+
+
+def test_torn_tail_is_truncated_and_log_stays_writable(tmp_path):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    j.set("a", 1)
+    j.set("b", 2)
+    j.close()
+    good_size = os.path.getsize(path)
+
+    # Crash halfway through appending a frame.
+    with open(path, "ab") as f:
+        f.write(_frame("set", "c", 3)[:-4])
+
+    j = _journal(path)
+    assert os.path.getsize(path) == good_size
+    assert j.get("a") == 1 and j.get("b") == 2 and j.get("c") is None
+    j.set("c", 4)
+    j.close()
+
+    j = _journal(path)
+    assert j.get("c") == 4
+    j.close()
+
+
+def test_corrupt_frame_drops_it_and_everything_after(tmp_path):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    j.set("a", 1)
+    j.close()
+    good_size = os.path.getsize(path)
+
+    bad = bytearray(_frame("set", "b", 2))
+    bad[-1] ^= 0xFF
+    with open(path, "ab") as f:
+        f.write(bytes(bad) + _frame("set", "c", 3))
+
+    j = _journal(path)
+    assert j.get("b") is None and j.get("c") is None
+    assert os.path.getsize(path) == good_size
+    j.close()
+
+
+def test_partial_magic_starts_empty(tmp_path):
+    path = tmp_path / "state.journal"
+    path.write_bytes(MAGIC[:2])
+
+    j = _journal(path)
+    j.set("a", 1)
+    j.close()
+
+    assert path.read_bytes().startswith(MAGIC)
+    j = _journal(path)
+    assert j.get("a") == 1
+    j.close()
+
+
+def test_foreign_file_is_refused_and_left_alone(tmp_path):
+    path = tmp_path / "state.journal"
+    path.write_text('{"last_trade_time": "2026-01-01T00:05:00"}')
+
+    with pytest.raises(ValueError):
+        _journal(path)
+    assert path.read_text() == '{"last_trade_time": "2026-01-01T00:05:00"}'
+
+
+def test_compact_keeps_state_and_shrinks_log(tmp_path):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    for i in range(1000):
+        j.set("candle", i)
+        j.incr("orders")
+    j.add("tickets", 7)
+    before = os.path.getsize(path)
+
+    j.compact()
+    assert os.path.getsize(path) < before
+    assert not os.path.exists(f"{path}.tmp")
+    j.set("after", True)
+    j.close()
+
+    j = _journal(path)
+    assert j.get("candle") == 999
+    assert j.get("orders") == 1000
+    assert j.members("tickets") == {7}
+    assert j.get("after") is True
+    j.close()
+
+
+def test_writes_during_compaction_are_kept(tmp_path):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    for i in range(200):
+        j.set(f"key:{i}", i)
+
+    stop = threading.Event()
+
+    def writer():
+        n = 0
+        while not stop.is_set():
+            n += 1
+            j.incr("writes")
+            j.set("last", n)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for _ in range(20):
+        j.compact()
+    stop.set()
+    thread.join()
+
+    writes, last = j.get("writes"), j.get("last")
+    j.close()
+
+    j = _journal(path)
+    assert j.get("writes") == writes
+    assert j.get("last") == last
+    assert j.get("key:199") == 199
+    j.close()
+
+
+def test_writers_do_not_wait_for_compaction_fsyncs(tmp_path, monkeypatch):
+    path = tmp_path / "state.journal"
+    j = _journal(path)
+    for i in range(500):
+        j.set(f"key:{i}", i)
+
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (time.sleep(0.2), real_fsync(fd)))
+    compaction = threading.Thread(target=j.compact)
+    compaction.start()
+    slowest = 0.0
+    while compaction.is_alive():
+        start = time.perf_counter()
+        j.incr("writes")
+        slowest = max(slowest, time.perf_counter() - start)
+    compaction.join()
+    monkeypatch.setattr(os, "fsync", real_fsync)
+    writes = j.get("writes")
+    j.close()
+
+    assert slowest < 0.1
+    j = _journal(path)
+    assert j.get("writes") == writes
+    assert j.get("key:499") == 499
+    j.close()
+
+
+def test_background_compaction(tmp_path):
+    path = tmp_path / "state.journal"
+    j = StateJournal(str(path), sync_interval=0.001, compact_ratio=4, min_compact_bytes=4096)
+    for i in range(2000):
+        j.set("candle", i)
+    j.set("candle", "done")
+
+    # The sync thread compacts some time after its fsync; poll instead of guessing when.
+    deadline = time.monotonic() + 5
+    while os.path.getsize(path) >= 4096 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    size = os.path.getsize(path)
+    j.close()
+
+    assert size < 4096
+    j = _journal(path)
+    assert j.get("candle") == "done"
+    j.close()
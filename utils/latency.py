@@ -0,0 +1,24 @@
+import statistics
+import time
+
+
+def now_ns():
+    # perf_counter is system-wide monotonic on Linux (CLOCK_MONOTONIC) and
+    # Windows (QueryPerformanceCounter), so stamps compare across processes.
+    return time.perf_counter_ns()
+
+
+def summarize(samples):
+    """{key: [ms, ...]} -> {key: {"count", "p50", "p95", "max"}}, skipping empty keys."""
+    summary = {}
+    for key, values in samples.items():
+        if not values:
+            continue
+        ordered = sorted(values)
+        summary[key] = {
+            "count": len(ordered),
+            "p50": statistics.median(ordered),
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max": ordered[-1],
+        }
+    return summary
@@ -0,0 +1,291 @@
+"""
+Append-only key/value journal for durable bot state.
+
+Every change is one small frame appended to the log: a little-endian u32
+length, a u32 CRC32, then the pickled (op, key, value). Reads come from an
+in-memory index, which is rebuilt by replaying the log on startup. A torn
+frame left by a crash or power loss is truncated away at that point.
+
+Writes cost one `os.write` to the page cache, a few microseconds. A
+background thread fsyncs whatever accumulated within `sync_interval`
+(group commit). Call `sync()` to wait for durability explicitly. The same
+thread also compacts the log once it holds several times more records than
+there are live keys. Compaction writes a snapshot to a temp file, copies
+over the frames appended meanwhile and fsyncs it, all without the write lock.
+Only the last few frames are copied under the lock, right before the temp
+file is `os.replace`d over the log. The directory is fsynced afterwards, so
+a crash at any point leaves either the old log or the new one.
+
+Values can be any picklable object. Set-valued keys (`add`/`discard`) and
+counters (`incr`) are first-class, so adding one ticket doesn't rewrite the
+whole set.
+"""
+
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+import zlib
+
+MAGIC = b"BSJ\x01"
+_FRAME = struct.Struct("<II")  # payload length, crc32(payload)
+_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+_CATCH_UP_BYTES = 64 << 10  # tail small enough to copy while holding the write lock
+_CATCH_UP_ROUNDS = 4
+
+
+class StateJournal:
+    def __init__(self, path, sync_interval=0.05, compact_ratio=4, min_compact_bytes=1 << 20):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self._index = {}
+        self._lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._records = 0
+        self._size = 0
+        self._dirty = threading.Event()
+        self._synced = threading.Condition(self._lock)
+        self._write_gen = 0
+        self._sync_gen = 0
+        self._closed = False
+
+        self._load()
+        self._fd = os.open(self.path, _FLAGS, 0o644)
+        if self._size == 0:
+            os.write(self._fd, MAGIC)
+            self._size = len(MAGIC)
+        self._syncer = threading.Thread(target=self._sync_loop, name="state-journal-sync", daemon=True)
+        self._syncer.start()
+
+    # --- reads: O(1) from the index ---
+
+    def get(self, key, default=None):
+        value = self._index.get(key, default)
+        return frozenset(value) if isinstance(value, set) else value
+
+    def members(self, key):
+        return frozenset(self._index.get(key, ()))
+
+    def keys(self, prefix=""):
+        return [k for k in self._index if k.startswith(prefix)]
+
+    # --- writes: append one frame, update the index ---
+
+    def set(self, key, value):
+        self._append("set", key, value)
+
+    def delete(self, key):
+        self._append("del", key, None)
+
+    def add(self, key, member):
+        self._append("add", key, member)
+
+    def discard(self, key, member):
+        self._append("discard", key, member)
+
+    def incr(self, key, amount=1):
+        return self._append("incr", key, amount)
+
+    def _append(self, op, key, value):
+        frame = _frame(op, key, value)
+        with self._lock:
+            if self._closed:
+                raise ValueError("state journal is closed")
+            os.write(self._fd, frame)
+            self._apply(op, key, value)
+            self._size += len(frame)
+            self._records += 1
+            self._write_gen += 1
+            result = self._index.get(key)
+        self._dirty.set()
+        return result
+
+    def _apply(self, op, key, value):
+        index = self._index
+        if op == "set":
+            index[key] = set(value) if isinstance(value, (set, frozenset)) else value
+        elif op == "del":
+            index.pop(key, None)
+        elif op == "add":
+            index.setdefault(key, set()).add(value)
+        elif op == "discard":
+            members = index.get(key)
+            if members is not None:
+                members.discard(value)
+                if not members:
+                    del index[key]
+        elif op == "incr":
+            index[key] = index.get(key, 0) + value
+
+    # --- durability ---
+
+    def sync(self, timeout=None):
+        """Block until everything written so far has been fsynced."""
+        with self._lock:
+            target = self._write_gen
+            self._dirty.set()
+            return self._synced.wait_for(lambda: self._sync_gen >= target or self._closed, timeout)
+
+    def _sync_loop(self):
+        while True:
+            self._dirty.wait()
+            if self._closed:
+                return
+            # Let writes within the window pile up into one fsync.
+            time.sleep(self.sync_interval)
+            self._dirty.clear()
+            # Never overlaps a compaction, so the fd can't be swapped mid-fsync.
+            with self._compacting:
+                with self._lock:
+                    if self._closed:
+                        return
+                    target = self._write_gen
+                    # fsync a duplicate outside the lock so writers never wait on the disk.
+                    fd = os.dup(self._fd)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                with self._lock:
+                    self._sync_gen = max(self._sync_gen, target)
+                    self._synced.notify_all()
+                    compact = not self._closed and self._needs_compaction()
+            if compact:
+                self.compact()
+
+    def _needs_compaction(self):
+        return (
+            self._size >= self.min_compact_bytes
+            and self._records > self.compact_ratio * max(1, len(self._index))
+        )
+
+    # --- compaction ---
+
+    def compact(self):
+        """
+        Rewrite the log as one `set` per live key. Every fsync runs outside the
+        write lock; writers only wait while the last few frames are copied and
+        the file is swapped.
+        """
+        with self._compacting:
+            with self._lock:
+                if self._closed:
+                    return
+                snapshot = {k: set(v) if isinstance(v, set) else v for k, v in self._index.items()}
+                copied, base_records = self._size, self._records
+
+            tmp = f"{self.path}.tmp"
+            out = open(tmp, "wb")
+            old = open(self.path, "rb")
+            try:
+                out.write(b"".join([MAGIC] + [_frame("set", k, v) for k, v in snapshot.items()]))
+                # Copy and fsync the frames appended meanwhile without the lock,
+                # until what's left is small enough to copy under it.
+                synced_gen = None
+                for _ in range(_CATCH_UP_ROUNDS):
+                    with self._lock:
+                        end, gen = self._size, self._write_gen
+                    old.seek(copied)
+                    out.write(old.read(end - copied))
+                    out.flush()
+                    os.fsync(out.fileno())
+                    synced_gen = gen
+                    if end - copied < _CATCH_UP_BYTES:
+                        copied = end
+                        break
+                    copied = end
+
+                with self._lock:
+                    if self._closed:
+                        return
+                    # Not fsynced here: like any fresh write, the sync thread covers it.
+                    old.seek(copied)
+                    out.write(old.read(self._size - copied))
+                    out.flush()
+                    size = out.tell()
+                    # Windows can't replace a file that is still open.
+                    old.close()
+                    out.close()
+                    os.close(self._fd)
+                    try:
+                        os.replace(tmp, self.path)
+                    finally:
+                        self._fd = os.open(self.path, _FLAGS, 0o644)
+                    self._size = size
+                    self._records = len(snapshot) + self._records - base_records
+            finally:
+                old.close()
+                out.close()
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+            _fsync_dir(self.path)
+            with self._lock:
+                self._sync_gen = max(self._sync_gen, synced_gen)
+                self._synced.notify_all()
+        self._dirty.set()
+
+    # --- recovery ---
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC) and not MAGIC.startswith(data):
+            # Never truncate a file we didn't write; it may be the wrong path.
+            raise ValueError(f"{self.path} is not a state journal")
+
+        good = 0
+        if data.startswith(MAGIC):  # otherwise a crash mid-way through writing it
+            pos = good = len(MAGIC)
+            while pos + _FRAME.size <= len(data):
+                length, crc = _FRAME.unpack_from(data, pos)
+                start, end = pos + _FRAME.size, pos + _FRAME.size + length
+                payload = data[start:end]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                self._apply(*pickle.loads(payload))
+                self._records += 1
+                pos = good = end
+
+        if good < len(data):
+            # Torn or corrupt tail (crash mid-append): drop it so new frames
+            # aren't written after garbage.
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        self._size = good
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._closed = True
+            self._sync_gen = self._write_gen
+            self._synced.notify_all()
+        self._dirty.set()
+        self._syncer.join(timeout=1)
+
+
+def _frame(op, key, value):
+    payload = pickle.dumps((op, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _fsync_dir(path):
+    # Makes the rename itself durable; Windows has no directory fds.
+    if sys.platform == "win32":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
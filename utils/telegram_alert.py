@@ -5,8 +5,24 @@ load_dotenv(override=True)
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# Optional hook that takes (send_fn, message) and runs it elsewhere, so callers
+# on the MT5 thread don't wait on the HTTP round-trip. None = send inline.
+_dispatcher = None
+
+
+def set_alert_dispatcher(dispatcher):
+    global _dispatcher
+    _dispatcher = dispatcher
+
 
 def send_telegram_alert(message: str):
+    if _dispatcher is not None:
+        _dispatcher(_post_telegram_alert, message)
+        return
+    _post_telegram_alert(message)
+
+
+def _post_telegram_alert(message: str):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("⚠️ Missing Telegram credentials in environment variables")
         return
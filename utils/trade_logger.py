@@ -4,6 +4,7 @@ import time
 from datetime import datetime
 
 LOG_FILE = "trades_log.csv"
+BOT_LOG_FILE = "gold_bot.log"
 
 LOG_FIELDS = [
     "timestamp",
@@ -72,7 +73,7 @@ def log_trade(order_type, price, stop_loss, take_profit, lot_size, order_id, bal
 
 
 @retry_on_file_lock
-def close_trade(order_id, close_price, reason="Closed"):
+def close_trade(order_id, close_price, reason="Closed", contract_size=None):
     if not os.path.exists(LOG_FILE):
         log("⚠️ Log file not found. Cannot update trade.")
         return
@@ -88,16 +89,18 @@ def close_trade(order_id, close_price, reason="Closed"):
                 lot_size = float(row["lot_size"])
                 order_type = row["order_type"]
 
-                # Calculate profit/loss for XAUUSD (1 lot = 100 oz)
-                if order_type == "BUY":
-                    profit_loss = (close_price - entry_price) * 100 * lot_size
+                # Calculate profit/loss from the symbol's contract size (units per lot)
+                if contract_size is None:
+                    profit_loss = None
+                elif order_type == "BUY":
+                    profit_loss = (close_price - entry_price) * contract_size * lot_size
                 else:
-                    profit_loss = (entry_price - close_price) * 100 * lot_size
+                    profit_loss = (entry_price - close_price) * contract_size * lot_size
 
                 row["status"] = "CLOSED"
                 row["close_price"] = round(close_price, 2)
                 row["close_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                row["profit_loss"] = round(profit_loss, 2)
+                row["profit_loss"] = round(profit_loss, 2) if profit_loss is not None else ""
                 row["close_reason"] = reason
                 updated = True
 
@@ -108,9 +111,8 @@ def close_trade(order_id, close_price, reason="Closed"):
             writer = csv.DictWriter(file, fieldnames=LOG_FIELDS)
             writer.writeheader()
             writer.writerows(rows)
-        log(
-            f"📘 Trade {order_id} closed. P/L: {round(profit_loss, 2)} USD | Reason: {reason}"
-        )
+        pnl_text = f"{round(profit_loss, 2)} USD" if profit_loss is not None else "n/a (contract size unknown)"
+        log(f"📘 Trade {order_id} closed. P/L: {pnl_text} | Reason: {reason}")
     else:
         log(f"⚠️ Trade {order_id} not found or already closed.")
 
@@ -120,6 +122,6 @@ def log(message: str, save_to_file=True):
     full_msg = f"[{timestamp}] {message}"
     print(full_msg)
     if save_to_file:
-        with open("gold_bot.log", "a", encoding="utf-8") as f:
+        with open(BOT_LOG_FILE, "a", encoding="utf-8") as f:
             f.write(full_msg + "\n")
 
@@ -1,18 +1,79 @@
 import json
 import os
+import threading
 from datetime import datetime
 
-TRACKER_FILE = "last_trade.json"
+from utils.state_journal import StateJournal
 
+STATE_FILE = "bot_state.journal"
+TRACKER_FILE = "last_trade.json"  # legacy single-timestamp file, migrated on first use (None: don't)
+LEGACY_SYMBOL = "XAUUSD"
 
-def load_last_trade_time():
-    if os.path.exists(TRACKER_FILE):
-        with open(TRACKER_FILE, "r") as f:
-            data = json.load(f)
-            return datetime.fromisoformat(data.get("last_trade_time"))
-    return None
+_state = None
+_state_lock = threading.Lock()
 
 
-def save_last_trade_time(dt):
-    with open(TRACKER_FILE, "w") as f:
-        json.dump({"last_trade_time": dt.isoformat()}, f)
+def get_state():
+    """The process-wide state journal, opened (and migrated) on first use."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = StateJournal(STATE_FILE)
+            _migrate_legacy(_state)
+    return _state
+
+
+def _migrate_legacy(state):
+    key = f"last_trade_candle:{LEGACY_SYMBOL}"
+    if state.get(key) is not None or not TRACKER_FILE or not os.path.exists(TRACKER_FILE):
+        return
+    with open(TRACKER_FILE, "r") as f:
+        data = json.load(f)
+    if data.get("last_trade_time"):
+        state.set(key, datetime.fromisoformat(data["last_trade_time"]))
+        state.sync()
+
+
+def load_last_trade_time(symbol=LEGACY_SYMBOL):
+    return get_state().get(f"last_trade_candle:{symbol}")
+
+
+def save_last_trade_time(dt, symbol=LEGACY_SYMBOL):
+    get_state().set(f"last_trade_candle:{symbol}", dt)
+
+
+def add_bot_ticket(ticket):
+    get_state().add("bot_tickets", int(ticket))
+
+
+def remove_bot_ticket(ticket):
+    get_state().discard("bot_tickets", int(ticket))
+
+
+def get_bot_tickets():
+    return get_state().members("bot_tickets")
+
+
+def prune_bot_tickets(open_tickets):
+    """Forget bot tickets that are no longer open (e.g. closed by SL/TP on the server)."""
+    state = get_state()
+    gone = state.members("bot_tickets") - set(open_tickets)
+    for ticket in gone:
+        state.discard("bot_tickets", ticket)
+    return gone
+
+
+def increment_counter(name, amount=1):
+    return get_state().incr(f"counter:{name}", amount)
+
+
+def get_counter(name):
+    return get_state().get(f"counter:{name}", 0)
+
+
+def close_state():
+    global _state
+    with _state_lock:
+        if _state is not None:
+            _state.close()
+            _state = None